@@ -0,0 +1,174 @@
+"""Headless throughput benchmark, reporting instructions per second per ROM.
+
+Each ROM is run headless with no throttling, for a number of cycles or a
+wall time budget, over repeated trials. Peak memory is measured in a separate
+run as tracing allocations slows execution.
+
+Usage: python bench.py path/to/rom [path/to/rom ...] [--engine ENGINE] [--json PATH]
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from chip8.backends.headless import HeadlessBackend, Display as HeadlessDisplay
+from chip8.cpu import Registers
+from chip8.interpreter import FRAME_RATE, Interpreter
+from chip8.memory import Memory
+from chip8.recompiler import load_file
+from main import ENGINES
+
+
+def create_interpreter(rom_path, engine: str, hertz: int) -> Interpreter:
+    cpu = ENGINES[engine](Memory(), HeadlessDisplay(), Registers())
+    if engine == "compiled":
+        cpu.install(load_file(rom_path))
+
+    interpreter = Interpreter(HeadlessBackend(), cpu, max(1, round(hertz / FRAME_RATE)))
+    interpreter.boot()
+    interpreter.load_rom(rom_path)
+
+    return interpreter
+
+
+def run_trial(
+    rom_path, engine: str, hertz: int, cycles: int, seconds: Optional[float] = None
+) -> Dict[str, float]:
+    """Run frames back to back until the cycle or time budget is spent.
+
+    Budgets are counted in frames, cycles / instructions per frame, so ROMs
+    waiting on a key still finish.
+    """
+    interpreter = create_interpreter(rom_path, engine, hertz)
+    instructions_per_frame = interpreter.instructions_per_frame
+    frames = math.ceil(cycles / instructions_per_frame)
+
+    executed = 0
+    frame = 0
+    start = time.perf_counter()
+    while True:
+        if seconds is None:
+            if frame >= frames:
+                break
+        elif time.perf_counter() - start >= seconds:
+            break
+
+        executed += interpreter.frame(instructions_per_frame)
+        frame += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "instructions": executed,
+        "frames": frame,
+        "seconds": elapsed,
+        "ips": executed / elapsed,
+        "fps": frame / elapsed,
+    }
+
+
+def peak_memory(rom_path, engine: str, hertz: int, cycles: int) -> int:
+    """Peak bytes allocated while loading and running a ROM."""
+    tracemalloc.start()
+    try:
+        run_trial(rom_path, engine, hertz, cycles)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def summarise(values: List[float]) -> Dict[str, float]:
+    return {
+        "median": statistics.median(values),
+        "variance": statistics.variance(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def bench(
+    rom_path,
+    engine: str,
+    hertz: int,
+    cycles: int,
+    seconds: Optional[float],
+    trials: int,
+) -> dict:
+    results = [
+        run_trial(rom_path, engine, hertz, cycles, seconds) for _ in range(trials)
+    ]
+
+    return {
+        "rom": str(rom_path),
+        "engine": engine,
+        "trials": results,
+        "ips": summarise([r["ips"] for r in results]),
+        "fps": summarise([r["fps"] for r in results]),
+        "peak_memory": peak_memory(rom_path, engine, hertz, cycles),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", type=str, nargs="+", help="Paths to rom files")
+    parser.add_argument(
+        "--engine",
+        help="CPU engines to benchmark, may be given more than once. Defaults to all",
+        choices=ENGINES.keys(),
+        action="append",
+    )
+    parser.add_argument(
+        "--hertz",
+        type=int,
+        help="Instructions per second the ROM is written for, sets instructions per frame",
+        default=500,
+    )
+    parser.add_argument(
+        "--cycles",
+        type=int,
+        help="Number of instructions per trial, rounded up to whole frames",
+        default=100_000,
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        help="Run each trial for this long instead of a number of cycles",
+    )
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--json", type=str, help="Write results as JSON to path")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.paths:
+        for engine in args.engine or ENGINES.keys():
+            result = bench(
+                path, engine, args.hertz, args.cycles, args.seconds, args.trials
+            )
+            results.append(result)
+            print(
+                f"{path} {engine:>11}: "
+                f"{result['ips']['median']:12,.0f} ips "
+                f"(variance {result['ips']['variance']:.3g}) "
+                f"{result['fps']['median']:10,.0f} fps "
+                f"{result['peak_memory'] / 1024:8,.0f} KiB peak"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "hertz": args.hertz,
+                    "cycles": args.cycles,
+                    "seconds": args.seconds,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
@@ -0,0 +1,36 @@
+"""Compare decoding an opcode by rule matching against the decode table.
+
+Usage: python -m benchmarks.decode [--number N]
+"""
+import argparse
+import timeit
+
+from chip8.cpu import Operation, decode_table, rules
+
+# A spread of opcodes from early and late in the rule list.
+OPCODES = [0x00E0, 0x1228, 0x6A02, 0x7A01, 0x8124, 0xA2EA, 0xD01F, 0xF165]
+
+
+def decode_by_rules():
+    for opcode in OPCODES:
+        operation = Operation.decode(opcode)
+        next(r for r in rules if r.match(operation)).type
+
+
+def decode_by_table(table=decode_table()):
+    for opcode in OPCODES:
+        table[opcode].type
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in [("rules", decode_by_rules), ("table", decode_by_table)]:
+        best = min(timeit.repeat(func, number=args.number, repeat=5))
+        results[name] = best / (args.number * len(OPCODES)) * 1e9
+        print(f"{name:>6}: {results[name]:8.1f} ns/decode")
+
+    print(f"speedup: {results['rules'] / results['table']:.1f}x")
@@ -0,0 +1,226 @@
+"""Time each family of operations in isolation, optionally against a baseline.
+
+Operations are executed through CPU.execute so dispatch is included. Sprite
+drawing and clearing run against both a stub display and the framebuffer.
+
+Timings are per operation, one sample per repeat. Comparing against a
+baseline flags families whose samples are significantly slower, by Welch's
+t-test, and exits with status 1 if there are any.
+
+Usage: python -m benchmarks.opcodes [--json PATH] [--baseline PATH]
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.decode import OPCODES
+from chip8.backends.headless import Display
+from chip8.cpu import CPU, Registers
+from chip8.memory import Memory
+
+# fmt: off
+ALU = [
+    0x6A02, 0x7A01, 0x8120, 0x8121, 0x8122, 0x8123, 0x8124, 0x8125, 0x8126,
+    0x8127, 0x812E,
+]
+# fmt: on
+SKIPS = [0x3A02, 0x4A02, 0x5120, 0x9120, 0xE19E, 0xE1A1]
+FONT_BCD = [0xF129, 0xF133]
+LOAD_STORE = [0xFF55, 0xFF65]
+
+# Critical value of t, roughly a 95% one-sided test at the default repeats.
+SIGNIFICANT_T = 2.0
+
+
+class StubDisplay:
+    def draw_sprite(self, sprite, x, y) -> bool:
+        return False
+
+    def clear(self):
+        pass
+
+    def update(self):
+        pass
+
+
+DISPLAYS = {"stub": StubDisplay, "framebuffer": Display}
+
+
+class Case(NamedTuple):
+    name: str
+    opcodes: List[int]
+    display: str = "stub"
+    # Time decoding alone rather than executing.
+    decode_only: bool = False
+
+
+CASES = [
+    Case("decode", OPCODES, decode_only=True),
+    Case("alu", ALU),
+    Case("skips", SKIPS),
+    Case("font_bcd", FONT_BCD),
+    Case("load_store", LOAD_STORE),
+    *(
+        Case(f"display_{height}/{display}", [0xD010 | height], display)
+        for height in (1, 8, 15)
+        for display in DISPLAYS
+    ),
+    *(Case(f"clear_screen/{display}", [0x00E0], display) for display in DISPLAYS),
+]
+
+
+def create_cpu(display: str) -> CPU:
+    cpu = CPU(Memory(), DISPLAYS[display](), Registers())
+    cpu.load_font()
+    for x in range(0x10):
+        cpu.v[x] = x * 7
+    # A sprite for DXYN to draw, and room for FX55 to write to.
+    cpu.index = 0x300
+    cpu.memory[0x300:0x310] = [0b10110101] * 0x10
+    return cpu
+
+
+def runner(case: Case) -> Callable[[], None]:
+    cpu = create_cpu(case.display)
+    instructions = [cpu.decode(opcode) for opcode in case.opcodes]
+
+    if case.decode_only:
+        decode = cpu.decode
+        opcodes = case.opcodes
+
+        def run():
+            for opcode in opcodes:
+                decode(opcode)
+
+        return run
+
+    execute = cpu.execute
+
+    def run():
+        for instruction in instructions:
+            execute(instruction)
+
+    return run
+
+
+def measure(case: Case, number: int, repeat: int) -> List[float]:
+    """Nanoseconds per operation, a sample per repeat."""
+    samples = timeit.repeat(runner(case), number=number, repeat=repeat)
+    return [sample / (number * len(case.opcodes)) * 1e9 for sample in samples]
+
+
+def welch_t(baseline: List[float], samples: List[float]) -> float:
+    """t statistic for samples being slower than baseline."""
+    error = math.sqrt(
+        statistics.variance(baseline) / len(baseline)
+        + statistics.variance(samples) / len(samples)
+    )
+    difference = statistics.mean(samples) - statistics.mean(baseline)
+    if error == 0:
+        return math.inf if difference > 0 else 0.0
+    return difference / error
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float
+    median: float
+    change: float
+    t: float
+    slower: bool
+
+
+def compare(
+    baseline: Dict[str, dict], results: Dict[str, dict], threshold: float = 0.05
+) -> List[Comparison]:
+    """Compare results to a baseline, family by family.
+
+    A family is slower if its median changed by more than threshold and its
+    samples are significantly slower. Families missing from either are
+    skipped.
+    """
+    comparisons = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        before, after = baseline[name]["samples"], result["samples"]
+        change = statistics.median(after) / statistics.median(before) - 1
+        t = welch_t(before, after)
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline=statistics.median(before),
+                median=statistics.median(after),
+                change=change,
+                t=t,
+                slower=change > threshold and t > SIGNIFICANT_T,
+            )
+        )
+
+    return comparisons
+
+
+def run(number: int, repeat: int, only: Optional[str] = None) -> Dict[str, dict]:
+    results = {}
+    for case in CASES:
+        if only and only not in case.name:
+            continue
+
+        samples = measure(case, number, repeat)
+        results[case.name] = {"median": statistics.median(samples), "samples": samples}
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", type=str, help="Only run families containing this")
+    parser.add_argument("--json", type=str, help="Write results as JSON to path")
+    parser.add_argument("--baseline", type=str, help="JSON results to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Relative slowdown of the median to flag, if significant",
+    )
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat, args.only)
+    for name, result in results.items():
+        print(f"{name:>24}: {result['median']:8.1f} ns/op")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        comparisons = compare(baseline, results, args.threshold)
+        print()
+        for c in comparisons:
+            flag = "SLOWER" if c.slower else ""
+            print(
+                f"{c.name:>24}: {c.baseline:8.1f} -> {c.median:8.1f} ns/op "
+                f"{c.change:+7.1%} t={c.t:6.2f} {flag}"
+            )
+
+        if any(c.slower for c in comparisons):
+            sys.exit(1)
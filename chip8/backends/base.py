@@ -1,4 +1,4 @@
-from typing import Protocol, Iterator, List
+from typing import Protocol, Iterator, List, Optional, Set, Tuple
 
 from .events import Event
 
@@ -24,6 +24,14 @@ class Backend(Protocol):
     def throttle(self):
         """Ensure event loop runs at an even cadence."""
 
+    def skip(self, frames: Optional[int] = None) -> int:
+        """Skip up to frames frames while the CPU idles, or as many as possible.
+
+        Backends running in real time don't skip, throttling sleeps through
+        the rest of an idle frame. Returns the number of frames skipped.
+        """
+        return 0
+
 
 class Renderable(Protocol):
     """A common protocol to display CHIP-8 games.
@@ -72,3 +80,74 @@ class Renderable(Protocol):
 
         Required to support opcode 0x0E0
         """
+
+    def update(self):
+        """Present the sprites drawn since the last update.
+
+        Called once per frame by the interpreter, drawing shouldn't present.
+        """
+
+
+class Framebuffer(Renderable):
+    """The screen's pixels, shared by the displays.
+
+    Each row is stored as a single int with the leftmost pixel in the highest
+    bit, so a sprite line is XORed on to a row, and checked for collisions,
+    with a few shifts. Displays only read the rows when presenting, and can
+    limit that to the rows in dirty.
+    """
+
+    width: int = WIDTH
+    height: int = HEIGHT
+
+    def __init__(self):
+        self.rows: List[int] = [0] * self.height
+        # Rows changed since the display last presented them
+        self.dirty: Set[int] = set()
+        # All bits of a row set
+        self.mask = (1 << self.width) - 1
+
+    def draw_sprite(self, sprite: Sprite, x: int, y: int) -> bool:
+        """XOR sprite on to the rows, wrapping at the edges."""
+        rows = self.rows
+        width = self.width
+        mask = self.mask
+        x %= width
+        does_sprite_overlap = False
+
+        for line_count, line in enumerate(sprite):
+            # Place the line at the left edge, then rotate it right to x
+            line <<= width - 8
+            line = (line >> x | line << (width - x)) & mask
+
+            row = (y + line_count) % self.height
+            if rows[row] & line:
+                does_sprite_overlap = True
+            rows[row] ^= line
+            self.dirty.add(row)
+
+        return does_sprite_overlap
+
+    def clear(self):
+        """Turn every pixel off."""
+        self.dirty.update(y for y, row in enumerate(self.rows) if row)
+        self.rows = [0] * self.height
+
+    def pixel(self, x: int, y: int) -> bool:
+        """Whether the pixel at x, y is on."""
+        return bool(self.rows[y] >> (self.width - 1 - x) & 1)
+
+    def take_dirty(self) -> List[int]:
+        """Return the dirty rows in order, marking them clean."""
+        dirty = sorted(self.dirty)
+        self.dirty.clear()
+        return dirty
+
+    def lit(self) -> Iterator[Tuple[int, int]]:
+        """Yield the x, y coordinates of every pixel that's on."""
+        for y, row in enumerate(self.rows):
+            while row:
+                # Take the lowest set bit, the rightmost pixel still on
+                bit = row & -row
+                yield self.width - bit.bit_length(), y
+                row ^= bit
@@ -0,0 +1,67 @@
+from typing import Dict, Iterator, List, Optional
+
+from .base import Backend, Framebuffer
+from .events import Event, EventType
+
+
+class HeadlessBackend(Backend):
+    """A backend with no window which never sleeps.
+
+    Events are scripted up front, keyed by the frame they're yielded in. If
+    frames is given a QUIT event is yielded once that many frames have run.
+    """
+
+    def __init__(
+        self,
+        events: Optional[Dict[int, List[Event]]] = None,
+        frames: Optional[int] = None,
+    ):
+        self.events = events or {}
+        self.frames = frames
+        # Index of the current frame, advanced by throttle
+        self.frame = -1
+
+    def get(self) -> Iterator[Event]:
+        """Yield the events scripted for the current frame."""
+        yield from self.events.get(self.frame, ())
+
+        if self.frames is not None and self.frame >= self.frames:
+            yield Event(type=EventType.QUIT)
+
+    def throttle(self):
+        """Start the next frame immediately."""
+        self.frame += 1
+
+    def skip(self, frames: Optional[int] = None) -> int:
+        """Fast forward up to frames frames, stopping before the next event."""
+        ends = [frame for frame in self.events if frame > self.frame]
+        if self.frames is not None:
+            ends.append(self.frames)
+        if frames is not None:
+            ends.append(self.frame + 1 + frames)
+        if not ends:
+            return 0
+
+        skipped = max(0, min(ends) - self.frame - 1)
+        self.frame += skipped
+        return skipped
+
+
+class Display(Framebuffer):
+    """An in-memory display, presenting only counts frames."""
+
+    def __init__(self):
+        super().__init__()
+        # Number of times the display has been presented
+        self.frames = 0
+
+    def update(self):
+        """Count the frame, there's nothing to present to."""
+        self.frames += 1
+
+    def __str__(self):
+        """The display as text, a line per row with # for pixels that are on."""
+        return "\n".join(
+            format(row, f"0{self.width}b").replace("0", ".").replace("1", "#")
+            for row in self.rows
+        )
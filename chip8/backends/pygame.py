@@ -1,10 +1,11 @@
 import enum
 import time
-from typing import Iterator
+from typing import Dict, Iterator
 
 import pygame
 
-from .base import Backend, Renderable, Sprite, WIDTH, HEIGHT
+from ..profiler import FrameProfiler
+from .base import Backend, Framebuffer
 from .events import Event, EventType
 
 import logging
@@ -63,78 +64,180 @@ class Color(enum.Enum):
     OFF = pygame.Color(0, 0, 0)
 
 
-class Display(Renderable):
+def runs(rows):
+    """Group sorted row indexes in to (start, end) runs of adjacent rows."""
+    start = end = rows[0]
+    for row in rows[1:]:
+        if row != end + 1:
+            yield start, end + 1
+            start = row
+        end = row
+    yield start, end + 1
 
-    width: int = WIDTH
-
-    height: int = HEIGHT
 
+class Display(Framebuffer):
     def __init__(self, scale):
         """Set up pygame surfaces for drawing.
 
         Create a pygame window, a display surface to render the game to
         and an additional surface to use as a scratch area.
         """
+        super().__init__()
+        self.scale = scale
+        # Height of the strip below the game area, in window pixels
+        self.strip = 0
         self.display = pygame.display.set_mode(
             (self.width * scale, self.height * scale),
         )
         self.surface = pygame.Surface((self.width, self.height))
 
-    def set_pixel(self, x, y) -> bool:
-        """Enable/disable a specific pixel.
+        # The mapped colour of each pixel in every possible byte of a row
+        on = self.surface.map_rgb(Color.ON.value)
+        off = self.surface.map_rgb(Color.OFF.value)
+        self.colors = [
+            [on if byte >> bit & 1 else off for bit in range(7, -1, -1)]
+            for byte in range(0x100)
+        ]
+
+    def reserve(self, strip: int):
+        """Resize the window to fit a strip of height strip below the game."""
+        self.strip = strip
+        self.display = pygame.display.set_mode(
+            (self.width * self.scale, self.height * self.scale + strip),
+        )
+        # The window is blank after resizing
+        self.dirty.update(range(self.height))
 
-        raises IndexError if pixel is queried outside of surface bounds.
+    def update(self):
+        """Copy the dirty rows to the display, updating only where they are.
 
-        Using pygame.Surface.set_at/get_at is slow. Manipulating a pygame.PixelArray
-        in memory may be a better approach.
+        Rows are written to the surface through a PixelArray, then each run
+        of adjacent rows is scaled and blitted on its own.
 
-        https://www.pygame.org/docs/ref/surface.html#pygame.Surface.get_at
+        https://www.pygame.org/docs/ref/pixelarray.html
+        https://www.pygame.org/docs/ref/display.html#pygame.display.update
         """
-        is_pixel_already_rendered = self.surface.get_at((x, y)) == Color.ON.value
-        color = Color.OFF.value if is_pixel_already_rendered else Color.ON.value
-        self.surface.set_at((x, y), color)
-
-        return is_pixel_already_rendered
-
-    def draw_sprite(self, sprite: Sprite, x, y) -> bool:
-        """Draw sprite to surface."""
-
-        does_sprite_overlap = False
-
-        for line_count, line in enumerate(sprite):
-            for char_count, character in enumerate(format(line, "08b")):
-                if character == "1":
-
-                    wrapped_x = (x + char_count) % self.width
-                    wrapped_y = (y + line_count) % self.height
-
-                    is_pixel_already_rendered = self.set_pixel(wrapped_x, wrapped_y)
-                    if is_pixel_already_rendered:
-                        does_sprite_overlap = True
-
-        self.update()
-
-        return does_sprite_overlap
-
-    def update(self):
-        """Bilt to the display to reflect changes made to a surface's pixels.
+        dirty = self.take_dirty()
+        if not dirty:
+            return
+
+        pixels = pygame.PixelArray(self.surface)
+        for y in dirty:
+            row = self.rows[y]
+            colors = []
+            for shift in range(self.width - 8, -1, -8):
+                colors += self.colors[row >> shift & 0xFF]
+            pixels[:, y] = colors
+        pixels.close()
+
+        rects = []
+        for start, end in runs(dirty):
+            strip = self.surface.subsurface((0, start, self.width, end - start))
+            rect = pygame.Rect(
+                0,
+                start * self.scale,
+                self.width * self.scale,
+                (end - start) * self.scale,
+            )
+            self.display.blit(pygame.transform.scale(strip, rect.size), rect)
+            rects.append(rect)
+
+        pygame.display.update(rects)
+
+
+class Hud(FrameProfiler):
+    """Performance overlay in a strip below the game, toggled by the HUD key.
+
+    Shows millions of instructions per second, frames per second, the mean
+    time to run a frame and to render, and the share of time spent idle
+    throttling. Figures are averaged over each interval seconds and drawn
+    once per interval, from text surfaces cached by their text.
+    """
 
-        This is sub-optimal. Since we know where the size of a sprite and where
-        it's drawn, performance may be improved by only blitting the affected
-        pixels.
-        """
-        # Transfer the changes made to the surface to the main display
-        # https://www.pygame.org/docs/ref/display.html#pygame.display.blit
-        self.display.blit(
-            pygame.transform.scale(self.surface, self.display.get_rect().size), (0, 0)
+    def __init__(self, display: Display, interval: float = 0.25):
+        self.display = display
+        self.interval = int(interval * 1e9)
+        self.height = 2 * display.scale
+        self.visible = False
+        self.font = None
+        self.texts: Dict[str, pygame.Surface] = {}
+        self.reset(time.perf_counter_ns())
+
+    def reset(self, now: int):
+        self.started = now
+        self.instructions = 0
+        self.frames = 0
+        # Nanoseconds spent running frames, rendering and throttling
+        self.busy = 0
+        self.rendering = 0
+        self.idle = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, self.height)
+        self.display.reserve(self.height if self.visible else 0)
+        self.reset(time.perf_counter_ns())
+
+    def span(self, name: str, start: int, end: int):
+        if name == "throttle":
+            self.idle += end - start
+        elif name == "update":
+            self.rendering += end - start
+
+    def frame(self, start: int, end: int, instructions: int):
+        self.instructions += instructions
+        self.frames += 1
+        self.busy += end - start
+
+        elapsed = end - self.started
+        if elapsed >= self.interval:
+            if self.visible:
+                self.draw(self.fields(elapsed))
+            self.reset(end)
+
+    def fields(self, elapsed: int):
+        """The text of each figure over elapsed nanoseconds."""
+        frames = self.frames or 1
+        return [
+            f"{self.instructions * 1e3 / elapsed:.2f} MIPS",
+            f"{self.frames * 1e9 / elapsed:.0f} fps",
+            f"frame {self.busy / frames / 1e6:.2f}ms",
+            f"render {self.rendering / frames / 1e6:.2f}ms",
+            f"idle {min(100, self.idle * 100 / elapsed):.0f}%",
+        ]
+
+    def text(self, text: str) -> pygame.Surface:
+        surface = self.texts.get(text)
+        if surface is None:
+            # Figures change, so don't keep every one ever shown
+            if len(self.texts) > 256:
+                self.texts.clear()
+            surface = self.texts[text] = self.font.render(
+                text, False, Color.ON.value, Color.OFF.value
+            )
+        return surface
+
+    def draw(self, fields):
+        display = self.display
+        rect = pygame.Rect(
+            0,
+            display.height * display.scale,
+            display.width * display.scale,
+            self.height,
         )
-        # Render a surface's surface to display
-        # https://www.pygame.org/docs/ref/display.html#pygame.display.flip
-        pygame.display.flip()
+        display.display.fill(Color.OFF.value, rect)
 
-    def clear(self):
-        """Clear surface. Used by opcode 0x00E0
+        x = rect.x + self.height // 2
+        for field in fields:
+            surface = self.text(field)
+            display.display.blit(
+                surface, (x, rect.y + (self.height - surface.get_height()) // 2)
+            )
+            x += surface.get_width() + self.height
 
-        https://www.pygame.org/docs/ref/surface.html?highlight=fill#pygame.Surface.fill
-        """
-        self.surface.fill(Color.OFF.value)
+        pygame.display.update(rect)
+
+    def stop(self):
+        pass
@@ -1,13 +1,14 @@
+import ctypes
 import enum
 import time
 
-from typing import Iterator
+from typing import Iterator, List
 
 import sdl2
 import sdl2.ext
 
 from .events import Event, EventType
-from .base import Backend, Renderable, Sprite, WIDTH, HEIGHT
+from .base import Backend, Framebuffer
 
 
 class PySDLBackend(Backend):
@@ -62,21 +63,18 @@ class Color(enum.Enum):
     OFF = sdl2.ext.Color(0, 0, 0)
 
 
-class Display(Renderable):
-
-    width: int = WIDTH
-    height: int = HEIGHT
-
+class Display(Framebuffer):
     def __init__(self, scale):
         """
-        - Surface: A collection of pixels for rendering
-        - Renderer: Handles drawing pixels to a window
+        - Texture: A 64x32 copy of the framebuffer, streamed to once per frame
+        - Renderer: Handles scaling the texture to the window
         - Window: Interface for graphics
 
-         - https://wiki.libsdl.org/SDL_Surface
+         - https://wiki.libsdl.org/SDL_Texture
          - https://wiki.libsdl.org/SDL_Renderer
          - https://wiki.libsdl.org/SDL_Window
         """
+        super().__init__()
         self.scale = scale
 
         self.window = sdl2.ext.Window(
@@ -86,55 +84,67 @@ class Display(Renderable):
         )
         self.window.show()
 
-        self.surface = self.window.get_surface()
-        self.renderer = sdl2.ext.Renderer(self.surface)
-        self.renderer.scale = (self.scale, self.scale)
+        # No flags lets SDL fall back to software rendering if needed
+        self.renderer = sdl2.ext.Renderer(self.window, flags=0)
+        self.texture = sdl2.SDL_CreateTexture(
+            self.renderer.sdlrenderer,
+            sdl2.SDL_PIXELFORMAT_ARGB8888,
+            sdl2.SDL_TEXTUREACCESS_STREAMING,
+            self.width,
+            self.height,
+        )
 
-    def set_pixel(self, x: int, y: int) -> bool:
-        """
-        Draw pixel to screen. Chip-8 has no framebuffer so pixels are drawn
-        immediately.
+        # ARGB8888 pixels are stored little endian, as BGRA bytes
+        on, off = (
+            bytes([c.b, c.g, c.r, c.a]) for c in (Color.ON.value, Color.OFF.value)
+        )
+        # The pixels of every possible byte of a row
+        self.colors = [
+            b"".join(on if byte >> bit & 1 else off for bit in range(7, -1, -1))
+            for byte in range(0x100)
+        ]
+        self.pitch = self.width * len(on)
+        self.pixels = bytearray(off * self.width * self.height)
 
-        Before drawing a pixel we check for whether the pixel has already been
-        drawn to report back to draw_sprite for basic collision detection.
+    def update(self):
+        """Stream the dirty rows to the texture and copy it to the window.
 
-        https://pysdl2.readthedocs.io/en/latest/modules/sdl2ext_pixelaccess.html#sdl2.ext.PixelView
+        Rows are converted to pixels in memory, then the texture is updated
+        with a single lock and copy and scaled to the window with a single
+        render copy. With no dirty rows the texture is left as is but still
+        presented, so the window is redrawn after being exposed or resized.
         """
-        pixel_view = sdl2.ext.PixelView(self.surface)
+        dirty = self.take_dirty()
+        if dirty:
+            self.stream(dirty)
 
-        is_pixel_already_rendered = (
-            sdl2.ext.ARGB(pixel_view[y * self.scale][x * self.scale]) == Color.ON.value
-        )
-        color = Color.OFF.value if is_pixel_already_rendered else Color.ON.value
-        self.renderer.draw_point((x, y), color=color)
+        sdl2.SDL_RenderCopy(self.renderer.sdlrenderer, self.texture, None, None)
         self.renderer.present()
 
-        return is_pixel_already_rendered
-
-    def draw_sprite(self, sprite: Sprite, x: int, y: int) -> bool:
-        """Draw sprite to renderer."""
-        does_sprite_overlap = False
-
-        for line_count, line in enumerate(sprite):
-            for char_count, character in enumerate(format(line, "08b")):
-
-                if character == "1":
-
-                    wrapped_x = (x + char_count) % self.width
-                    wrapped_y = (y + line_count) % self.height
-
-                    is_pixel_already_rendered = self.set_pixel(wrapped_x, wrapped_y)
-                    if is_pixel_already_rendered:
-                        does_sprite_overlap = True
-
-        self.update()
-
-        return does_sprite_overlap
-
-    def update(self):
-        """Draw changes made to renderer to screen."""
-        self.window.refresh()
-
-    def clear(self):
-        """Clear the display by setting all pixels to 'off'."""
-        sdl2.ext.fill(self.surface, Color.OFF.value)
+    def stream(self, dirty: List[int]):
+        """Convert the dirty rows to pixels and copy them to the texture."""
+        for y in dirty:
+            row = self.rows[y]
+            start = y * self.pitch
+            self.pixels[start : start + self.pitch] = b"".join(
+                self.colors[row >> shift & 0xFF]
+                for shift in range(self.width - 8, -1, -8)
+            )
+
+        pixels = ctypes.c_void_p()
+        pitch = ctypes.c_int()
+        sdl2.SDL_LockTexture(
+            self.texture, None, ctypes.byref(pixels), ctypes.byref(pitch)
+        )
+        buffer = (ctypes.c_char * len(self.pixels)).from_buffer(self.pixels)
+        if pitch.value == self.pitch:
+            ctypes.memmove(pixels, buffer, len(self.pixels))
+        else:
+            # Rows of the texture may be padded
+            for y in range(self.height):
+                ctypes.memmove(
+                    pixels.value + y * pitch.value,
+                    ctypes.byref(buffer, y * self.pitch),
+                    self.pitch,
+                )
+        sdl2.SDL_UnlockTexture(self.texture)
@@ -1,62 +1,84 @@
 from ctypes import c_uint8
 from dataclasses import dataclass
-from functools import cached_property
+from functools import cache, cached_property
 from random import random
-from typing import Optional
+from typing import Callable, List, NamedTuple, Optional, Set
 import enum
 import math
 
 from .backends.base import Renderable
 from .fonts import Font
+from .memory import InvalidMemoryAddressError
 
 FONT_ADDRESS_START = 0x050
 FONT_ADDRESS_END = 0x0A0
 
+# The three decimal digits of every byte, as stored by FX33.
+BINARY_CODED_DECIMAL = [
+    bytes([value // 100, value // 10 % 10, value % 10]) for value in range(0x100)
+]
+
 
 class InvalidRegisterError(Exception):
     """Exception raised if invalid register is accessed or mutated."""
 
 
+def register(index: int) -> property:
+    """Attribute access to a single register, e.g. Registers.VA."""
+
+    def get(self) -> int:
+        return self.v[index]
+
+    def set(self, value: int):
+        self.v[index] = value & 0xFF
+
+    return property(get, set)
+
+
 class Registers:
     """Class managing Chip-8's 16 general purpose regisers.
 
     Referenced as Vx where x is a hex number. Registers are accessed using
-    subscription, passing the register's hex number. Stored values should be
-    one byte in length.
+    subscription, passing the register's hex number. Stored values are one
+    byte in length, wrapping around on overflow.
+
+    The registers are stored together in the bytearray v so they can be
+    copied to and from memory in bulk. The CPU uses v directly.
 
     VF is used by the intepretor as a flag.
     """
 
-    V0: c_uint8 = c_uint8(0b0)
-    V1: c_uint8 = c_uint8(0b0)
-    V2: c_uint8 = c_uint8(0b0)
-    V3: c_uint8 = c_uint8(0b0)
-    V4: c_uint8 = c_uint8(0b0)
-    V5: c_uint8 = c_uint8(0b0)
-    V6: c_uint8 = c_uint8(0b0)
-    V7: c_uint8 = c_uint8(0b0)
-    V8: c_uint8 = c_uint8(0b0)
-    V9: c_uint8 = c_uint8(0b0)
-    VA: c_uint8 = c_uint8(0b0)
-    VB: c_uint8 = c_uint8(0b0)
-    VC: c_uint8 = c_uint8(0b0)
-    VD: c_uint8 = c_uint8(0b0)
-    VE: c_uint8 = c_uint8(0b0)
-    VF: c_uint8 = c_uint8(0b0)
-
-    def __getitem__(self, index: int) -> c_uint8:
+    V0 = register(0x0)
+    V1 = register(0x1)
+    V2 = register(0x2)
+    V3 = register(0x3)
+    V4 = register(0x4)
+    V5 = register(0x5)
+    V6 = register(0x6)
+    V7 = register(0x7)
+    V8 = register(0x8)
+    V9 = register(0x9)
+    VA = register(0xA)
+    VB = register(0xB)
+    VC = register(0xC)
+    VD = register(0xD)
+    VE = register(0xE)
+    VF = register(0xF)
+
+    def __init__(self):
+        self.v = bytearray(0x10)
+
+    def __getitem__(self, index: int) -> int:
         """Fetch item from register or raise InvalidRegisterError."""
-        try:
-            return getattr(self, f"V{index:X}")
-        except (AttributeError, ValueError) as e:
-            raise InvalidRegisterError(f"Attempt to get value from {index}") from e
+        if index not in range(0x10):
+            raise InvalidRegisterError(f"Attempt to get value from {index}")
+        return self.v[index]
 
-    def __setitem__(self, index: int, value: c_uint8):
+    def __setitem__(self, index: int, value: int):
         """Set item from register or raise InvalidRegisterError."""
-        try:
-            setattr(self, f"V{index:X}", value)
-        except (AttributeError, ValueError) as e:
-            raise InvalidRegisterError(f"Attempt to set value in {index}") from e
+        if index not in range(0x10):
+            raise InvalidRegisterError(f"Attempt to set value in {index}")
+        self.v[index] = value & 0xFF
 
 
 class OperationType(enum.Enum):
@@ -94,6 +116,10 @@ class OperationType(enum.Enum):
     LOAD_REGISTERS = enum.auto()
     STORE_REGISTERS = enum.auto()
 
+    # Members are singletons so hash by identity. Enum's default hashes the
+    # member's name in Python, which is too slow for per-cycle dispatch.
+    __hash__ = object.__hash__
+
 
 @dataclass(frozen=True)
 class OperationMatchRule:
@@ -210,14 +236,14 @@ class Operation:
 
     @cached_property
     def type(self):
-        try:
-            rule = next(r for r in rules if r.match(self))
-        except StopIteration as e:
+        instruction = decode_table()[self.opcode]
+        if instruction is None:
             raise UnhandledOperationError(
-                f"Unhandled operation for opcode: {hex(self.opcode)}", operation=self,
-            ) from e
+                f"Unhandled operation for opcode: {hex(self.opcode)}",
+                operation=self,
+            )
 
-        return rule.type
+        return instruction.type
 
     def __repr__(self):
         return (
@@ -241,18 +267,142 @@ class UnhandledOperationError(Exception):
         self.operation = operation
 
 
+class StopReason(enum.Enum):
+    """Why CPU.run_until returned."""
+
+    CYCLES = enum.auto()
+    PREDICATE = enum.auto()
+    BREAKPOINT = enum.auto()
+    # The next instruction waits for a key and none is pressed.
+    KEY_WAIT = enum.auto()
+    # The next instruction jumps to itself, spinning forever.
+    JUMP_TO_SELF = enum.auto()
+    # The next instruction loops back to poll the delay timer while it runs.
+    DELAY_WAIT = enum.auto()
+    UNHANDLED_OPERATION = enum.auto()
+
+
+class Instruction(NamedTuple):
+    """A pre-decoded opcode, as stored in the decode table.
+
+    Shares its field names with Operation, but operands are plain ints (nn
+    included) to avoid allocating per cycle. Handlers expect an Instruction.
+    """
+
+    type: OperationType
+    x: int
+    y: int
+    n: int
+    nn: int
+    nnn: int
+    opcode: int
+
+
+@cache
+def decode_table() -> List[Optional[Instruction]]:
+    """Build a lookup of every 16-bit opcode to its decoded Instruction.
+
+    Built once per process. Rules only inspect the first nibble and the last
+    byte of an opcode so they're matched 4096 times rather than 65536 times.
+    Opcodes without a matching rule are stored as None.
+    """
+    types = []
+    for nibble in range(0x10):
+        for nn in range(0x100):
+            operation = Operation.decode(nibble << 12 | nn)
+            rule = next((r for r in rules if r.match(operation)), None)
+            types.append(rule.type if rule else None)
+
+    table: List[Optional[Instruction]] = []
+    for opcode in range(0x10000):
+        operation_type = types[opcode >> 12 << 8 | opcode & 0xFF]
+        if operation_type is None:
+            table.append(None)
+            continue
+
+        table.append(
+            Instruction(
+                type=operation_type,
+                x=opcode >> 8 & 0xF,
+                y=opcode >> 4 & 0xF,
+                n=opcode & 0xF,
+                nn=opcode & 0xFF,
+                nnn=opcode & 0xFFF,
+                opcode=opcode,
+            )
+        )
+
+    return table
+
+
 class CPU:
     def __init__(self, memory, display: Renderable, registers):
         self.memory = memory
         self.display = display
         self.registers = registers
+        # The register file itself, used directly by the handlers
+        self.v = registers.v
         self.stack_pointer = 0x0
-        self.delay_timer = c_uint8(0x0)
-        self.sound_timer = c_uint8(0x0)
+        self.delay_timer = 0x0
+        self.sound_timer = 0x0
         self.program_counter = 0x200
         self.index = 0
         self.stack = {}
         self.keycode = None
+        # Addresses run_until stops before executing.
+        self.breakpoints: Set[int] = set()
+        self.stop_reason: Optional[StopReason] = None
+        # Set when run_until stops at an opcode it can't decode.
+        self.error: Optional[UnhandledOperationError] = None
+        # Address of each character's glyph, indexed by the character.
+        # Assumes the standard layout until load_font is called.
+        self.font_addresses = list(range(FONT_ADDRESS_START, FONT_ADDRESS_END, 5))
+        self.decode_table = decode_table()
+        # fmt: off
+        self.handlers = {
+            OperationType.CLEAR_SCREEN: self.execute_clear_screen,
+            OperationType.RETURN: self.execute_return,
+            OperationType.JUMP: self.execute_jump,
+            OperationType.CALL: self.execute_call,
+            OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL: self.execute_skip_if_vx_and_nn_are_equal,
+            OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL: self.execute_skip_if_vx_and_nn_are_not_equal,
+            OperationType.SKIP_IF_VX_AND_VY_ARE_EQUAL: self.execute_skip_if_vx_and_vy_are_equal,
+            OperationType.SET_REGISTER: self.execute_set_register,
+            OperationType.ADD: self.execute_add,
+            OperationType.SET_VX: self.execute_set_vx,
+            OperationType.SET_VX_TO_VX_OR_VY: self.execute_set_vx_to_vx_or_vy,
+            OperationType.SET_VX_TO_VX_AND_VY: self.execute_set_vx_to_vx_and_vy,
+            OperationType.SET_VX_TO_VX_XOR_VY: self.execute_set_vx_to_vx_xor_vy,
+            OperationType.SET_VX_TO_VX_ADD_VY: self.execute_set_vx_to_vx_add_vy,
+            OperationType.SET_VX_TO_VX_SUB_VY: self.execute_set_vx_to_vx_sub_vy,
+            OperationType.SHIFT_VX_RIGHT: self.execute_shift_vx_right,
+            OperationType.SET_VX_TO_VY_SUB_VX: self.execute_set_vx_to_vy_sub_vx,
+            OperationType.SHIFT_VX_LEFT: self.execute_shift_vx_left,
+            OperationType.SKIP_IF_VX_AND_VY_ARE_NOT_EQUAL: self.execute_skip_if_vx_and_vy_are_not_equal,
+            OperationType.SET_INDEX: self.execute_set_index,
+            OperationType.RANDOM: self.execute_random,
+            OperationType.DISPLAY: self.execute_display,
+            OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_EQUAL: self.execute_skip_if_vx_and_keycode_are_equal,
+            OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_NOT_EQUAL: self.execute_skip_if_vx_and_keycode_are_not_equal,
+            OperationType.WAIT_FOR_KEY_PRESS: self.execute_wait_for_key_press,
+            OperationType.SET_DELAY_TIMER_TO_VX: self.execute_set_delay_timer_to_vx,
+            OperationType.SET_SOUND_TIMER_TO_VX: self.execute_set_sound_timer_to_vx,
+            OperationType.SET_VX_TO_DELAY_TIMER: self.execute_set_vx_to_delay_timer,
+            OperationType.ADD_VX_TO_INDEX: self.execute_add_vx_to_index,
+            OperationType.FONT: self.execute_font,
+            OperationType.STORE_BINARY_CODED_DECIMAL: self.execute_store_binary_coded_decimal,
+            OperationType.LOAD_REGISTERS: self.execute_load_registers,
+            OperationType.STORE_REGISTERS: self.execute_store_registers,
+        }
+        # fmt: on
+
+    def load_font(self, start: int = FONT_ADDRESS_START):
+        """Load the system font into memory, recording where each glyph is."""
+        self.font_addresses = []
+        for location, font in enumerate(Font):
+            address = start + location * len(font.value)
+            self.memory[address : address + len(font.value)] = font.value
+            self.font_addresses.append(address)
 
     def fetch(self) -> int:
         """Fetch next opcode from memory.
@@ -267,198 +417,310 @@ class CPU:
 
         return instruction << 8 | instruction2
 
-    def decode(self, opcode: int) -> Operation:
-        """Decode opcode into an Operation."""
-        return Operation.decode(opcode)
-
-    def execute(self, operation: Operation):
-        """Execute opcode."""
-        if operation.type == OperationType.CLEAR_SCREEN:
-            self.display.clear()
-
-        elif operation.type == OperationType.RETURN:
-            self.program_counter = self.stack[self.stack_pointer]
-            self.stack_pointer -= 1
-
-        elif operation.type == OperationType.JUMP:
-            self.program_counter = operation.nnn
-
-        elif operation.type == OperationType.CALL:
-            self.stack_pointer += 1
-            self.stack[self.stack_pointer] = self.program_counter
-            self.program_counter = operation.nnn
-
-        elif operation.type == OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL:
-            if self.registers[operation.x].value == operation.nn.value:
-                self.program_counter += 2
-
-        elif operation.type == OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL:
-            if self.registers[operation.x].value != operation.nn.value:
-                self.program_counter += 2
-
-        elif operation.type == OperationType.SKIP_IF_VX_AND_VY_ARE_EQUAL:
-            if self.registers[operation.x].value == self.registers[operation.y].value:
-                self.program_counter += 2
-
-        elif operation.type == OperationType.SET_REGISTER:
-            self.registers[operation.x] = operation.nn
-
-        elif operation.type == OperationType.ADD:
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.x].value + operation.nn.value
+    def decode(self, opcode: int) -> Instruction:
+        """Decode opcode into an Instruction using the precomputed table."""
+        instruction = self.decode_table[opcode]
+        if instruction is None:
+            raise UnhandledOperationError(
+                f"Unhandled operation for opcode: {hex(opcode)}",
+                operation=Operation.decode(opcode),
             )
 
-        elif operation.type == OperationType.SET_VX:
-            self.registers[operation.x] = self.registers[operation.y]
+        return instruction
 
-        elif operation.type == OperationType.SET_VX_TO_VX_OR_VY:
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.x].value | self.registers[operation.y].value
-            )
+    def execute(self, operation: Instruction):
+        """Execute opcode by dispatching to its OperationType's handler."""
+        self.handlers[operation.type](operation)
 
-        elif operation.type == OperationType.SET_VX_TO_VX_AND_VY:
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.x].value & self.registers[operation.y].value
-            )
+    def execute_clear_screen(self, operation: Instruction):
+        """00E0: Clear the screen."""
+        self.display.clear()
 
-        elif operation.type == OperationType.SET_VX_TO_VX_XOR_VY:
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.x].value ^ self.registers[operation.y].value
-            )
+    def execute_return(self, operation: Instruction):
+        """00EE: Return from a subroutine."""
+        self.program_counter = self.stack[self.stack_pointer]
+        self.stack_pointer -= 1
 
-        elif operation.type == OperationType.SET_VX_TO_VX_ADD_VY:
-            total = (
-                self.registers[operation.x].value + self.registers[operation.y].value
-            )
-            self.registers[operation.x] = c_uint8(total)
-            if total >= 255:
-                self.registers[0xF] = c_uint8(1)
-            else:
-                self.registers[0xF] = c_uint8(0)
-
-        elif operation.type == OperationType.SET_VX_TO_VX_SUB_VY:
-
-            if self.registers[operation.x].value > self.registers[operation.y].value:
-                self.registers[0xF] = c_uint8(1)
-            else:
-                self.registers[0xF] = c_uint8(0)
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.x].value - self.registers[operation.y].value
-            )
+    def execute_jump(self, operation: Instruction):
+        """1NNN: Jump to address NNN."""
+        self.program_counter = operation.nnn
 
-        elif operation.type == OperationType.SHIFT_VX_RIGHT:
-            self.registers[0xF] = c_uint8(self.registers[operation.x].value & 0x1)
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.y].value >> 1
-            )
+    def execute_call(self, operation: Instruction):
+        """2NNN: Call the subroutine at NNN."""
+        self.stack_pointer += 1
+        self.stack[self.stack_pointer] = self.program_counter
+        self.program_counter = operation.nnn
 
-        elif operation.type == OperationType.SET_VX_TO_VY_SUB_VX:
-            if self.registers[operation.y].value > self.registers[operation.x].value:
-                self.registers[0xF] = c_uint8(1)
-            else:
-                self.registers[0xF] = c_uint8(0)
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.y].value - self.registers[operation.x].value
-            )
+    def execute_skip_if_vx_and_nn_are_equal(self, operation: Instruction):
+        """3XNN: Skip the next instruction if VX equals NN."""
+        if self.v[operation.x] == operation.nn:
+            self.program_counter += 2
 
-        elif operation.type == OperationType.SHIFT_VX_LEFT:
-            self.registers[0xF] = c_uint8(self.registers[operation.x].value >> 7 & 1)
-            self.registers[operation.x] = c_uint8(
-                self.registers[operation.y].value << 1
-            )
+    def execute_skip_if_vx_and_nn_are_not_equal(self, operation: Instruction):
+        """4XNN: Skip the next instruction if VX doesn't equal NN."""
+        if self.v[operation.x] != operation.nn:
+            self.program_counter += 2
 
-        elif operation.type == OperationType.SKIP_IF_VX_AND_VY_ARE_NOT_EQUAL:
-            if self.registers[operation.x].value != self.registers[operation.y].value:
-                self.program_counter += 2
+    def execute_skip_if_vx_and_vy_are_equal(self, operation: Instruction):
+        """5XY0: Skip the next instruction if VX equals VY."""
+        if self.v[operation.x] == self.v[operation.y]:
+            self.program_counter += 2
 
-        elif operation.type == OperationType.SET_INDEX:
-            self.index = operation.nnn
+    def execute_set_register(self, operation: Instruction):
+        """6XNN: Set VX to NN."""
+        self.v[operation.x] = operation.nn
+
+    def execute_add(self, operation: Instruction):
+        """7XNN: Add NN to VX without setting the carry flag."""
+        v = self.v
+        v[operation.x] = (v[operation.x] + operation.nn) & 0xFF
+
+    def execute_set_vx(self, operation: Instruction):
+        """8XY0: Set VX to VY."""
+        self.v[operation.x] = self.v[operation.y]
+
+    def execute_set_vx_to_vx_or_vy(self, operation: Instruction):
+        """8XY1: Set VX to VX | VY."""
+        self.v[operation.x] |= self.v[operation.y]
+
+    def execute_set_vx_to_vx_and_vy(self, operation: Instruction):
+        """8XY2: Set VX to VX & VY."""
+        self.v[operation.x] &= self.v[operation.y]
+
+    def execute_set_vx_to_vx_xor_vy(self, operation: Instruction):
+        """8XY3: Set VX to VX ^ VY."""
+        self.v[operation.x] ^= self.v[operation.y]
+
+    def execute_set_vx_to_vx_add_vy(self, operation: Instruction):
+        """8XY4: Set VX to VX + VY, VF is set on carry."""
+        v = self.v
+        total = v[operation.x] + v[operation.y]
+        v[operation.x] = total & 0xFF
+        v[0xF] = 1 if total >= 255 else 0
+
+    def execute_set_vx_to_vx_sub_vy(self, operation: Instruction):
+        """8XY5: Set VX to VX - VY, VF is cleared on borrow."""
+        v = self.v
+        v[0xF] = 1 if v[operation.x] > v[operation.y] else 0
+        v[operation.x] = (v[operation.x] - v[operation.y]) & 0xFF
+
+    def execute_shift_vx_right(self, operation: Instruction):
+        """8XY6: Set VX to VY >> 1, VF is set to the shifted out bit."""
+        v = self.v
+        v[0xF] = v[operation.x] & 0x1
+        v[operation.x] = v[operation.y] >> 1
+
+    def execute_set_vx_to_vy_sub_vx(self, operation: Instruction):
+        """8XY7: Set VX to VY - VX, VF is cleared on borrow."""
+        v = self.v
+        v[0xF] = 1 if v[operation.y] > v[operation.x] else 0
+        v[operation.x] = (v[operation.y] - v[operation.x]) & 0xFF
+
+    def execute_shift_vx_left(self, operation: Instruction):
+        """8XYE: Set VX to VY << 1, VF is set to the shifted out bit."""
+        v = self.v
+        v[0xF] = (v[operation.x] >> 7) & 1
+        v[operation.x] = (v[operation.y] << 1) & 0xFF
+
+    def execute_skip_if_vx_and_vy_are_not_equal(self, operation: Instruction):
+        """9XY0: Skip the next instruction if VX doesn't equal VY."""
+        if self.v[operation.x] != self.v[operation.y]:
+            self.program_counter += 2
 
-        elif operation.type == OperationType.RANDOM:
-            self.registers[operation.x] = c_uint8(
-                math.ceil(random() * 255) & operation.nn.value
-            )
+    def execute_set_index(self, operation: Instruction):
+        """ANNN: Set the index register to NNN."""
+        self.index = operation.nnn
+
+    def execute_random(self, operation: Instruction):
+        """CXNN: Set VX to a random number masked by NN."""
+        self.v[operation.x] = math.ceil(random() * 255) & operation.nn
+
+    def execute_display(self, operation: Instruction):
+        """DXYN: Draw an N byte sprite from the index register at VX, VY."""
+        sprite = self.memory[self.index : self.index + operation.n]
+        collision = self.display.draw_sprite(
+            sprite,
+            self.v[operation.x],
+            self.v[operation.y],
+        )
+        self.v[0xF] = 1 if collision else 0
 
-        elif operation.type == OperationType.DISPLAY:
-            sprite = [
-                self.memory[i] for i in range(self.index, self.index + operation.n)
-            ]
-            collision = self.display.draw_sprite(
-                sprite,
-                self.registers[operation.x].value,
-                self.registers[operation.y].value,
-            )
-            self.registers[0xF] = c_uint8(collision)
+    def execute_skip_if_vx_and_keycode_are_equal(self, operation: Instruction):
+        """EX9E: Skip the next instruction if the key in VX is pressed."""
+        if self.v[operation.x] == self.keycode:
+            self.program_counter += 2
+
+    def execute_skip_if_vx_and_keycode_are_not_equal(self, operation: Instruction):
+        """EXA1: Skip the next instruction if the key in VX isn't pressed."""
+        if self.v[operation.x] != self.keycode:
+            self.program_counter += 2
 
-        elif operation.type == OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_EQUAL:
-            if self.registers[operation.x].value == self.keycode:
-                self.program_counter += 2
+    def execute_wait_for_key_press(self, operation: Instruction):
+        """FX0A: Store the pressed key in VX.
 
-        elif operation.type == OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_NOT_EQUAL:
-            if self.registers[operation.x].value != self.keycode:
-                self.program_counter += 2
+        run_until stops before FX0A while no key is pressed, so once this
+        runs the following instruction is next as usual.
+        """
+        if self.keycode is None:
+            return
 
-        elif operation.type == OperationType.WAIT_FOR_KEY_PRESS:
-            # Only advance if a key is pressed
-            if not self.keycode:
-                return
+        self.v[operation.x] = self.keycode
 
-            self.registers[operation.x] = c_uint8(self.keycode)
-            self.program_counter += 2
+    def execute_set_delay_timer_to_vx(self, operation: Instruction):
+        """FX15: Set the delay timer to VX."""
+        self.delay_timer = self.v[operation.x]
 
-        elif operation.type == OperationType.SET_DELAY_TIMER_TO_VX:
-            self.delay_timer = self.registers[operation.x]
+    def execute_set_sound_timer_to_vx(self, operation: Instruction):
+        """FX18: Set the sound timer to VX."""
+        self.sound_timer = self.v[operation.x]
 
-        elif operation.type == OperationType.SET_SOUND_TIMER_TO_VX:
-            self.sound_timer = self.registers[operation.x]
+    def execute_set_vx_to_delay_timer(self, operation: Instruction):
+        """FX07: Set VX to the delay timer."""
+        self.v[operation.x] = self.delay_timer
 
-        elif operation.type == OperationType.SET_VX_TO_DELAY_TIMER:
-            self.registers[operation.x] = self.delay_timer
+    def execute_add_vx_to_index(self, operation: Instruction):
+        """FX1E: Add VX to the index register."""
+        self.index = self.index + self.v[operation.x]
 
-        elif operation.type == OperationType.ADD_VX_TO_INDEX:
-            self.index = self.index + self.registers[operation.x].value
+    def execute_font(self, operation: Instruction):
+        """FX29: Point the index register at the font sprite for VX.
 
-        elif operation.type == OperationType.FONT:
-            character = self.registers[operation.x].value
-            sprite = Font.mapping_for_character(character)
-            self.index = next(
-                location
-                for location in range(FONT_ADDRESS_START, FONT_ADDRESS_END, 5)
-                if self.memory[location : location + len(sprite)] == sprite
-            )
+        Only the lowest nibble of VX is used.
+        """
+        self.index = self.font_addresses[self.v[operation.x] & 0xF]
 
-        elif operation.type == OperationType.STORE_BINARY_CODED_DECIMAL:
-            value = self.registers[operation.x].value
-            self.memory[self.index : self.index + len(str(value))] = [
-                int(i) for i in str(value)
-            ]
+    def execute_store_binary_coded_decimal(self, operation: Instruction):
+        """FX33: Store the decimal digits of VX from the index register."""
+        self.memory[self.index : self.index + 3] = BINARY_CODED_DECIMAL[
+            self.v[operation.x]
+        ]
 
-        elif operation.type == OperationType.LOAD_REGISTERS:
-            for i in range(0x0, operation.x + 1):
-                self.memory[self.index + i] = self.registers[i].value
+    def execute_load_registers(self, operation: Instruction):
+        """FX55: Copy V0 to VX into memory from the index register."""
+        end = operation.x + 1
+        self.memory[self.index : self.index + end] = self.v[:end]
 
-        elif operation.type == OperationType.STORE_REGISTERS:
-            for i in range(0x0, operation.x + 1):
-                self.registers[i] = c_uint8(self.memory[self.index + i])
+    def execute_store_registers(self, operation: Instruction):
+        """FX65: Copy memory from the index register into V0 to VX."""
+        end = operation.x + 1
+        self.v[:end] = self.memory[self.index : self.index + end]
 
     def cycle(self):
         """Emulate a single CPU cycle.
 
-        Called once per cycle of the Event loop
+        Timers aren't counted down, the interpreter ticks them once per frame.
         """
         opcode = self.fetch()
         operation = self.decode(opcode)
         self.execute(operation)
 
-        if self.delay_timer.value > 0:
-            self.delay_timer = c_uint8(self.delay_timer.value - 1)
-
-        if self.sound_timer.value > 0:
-            self.sound_timer = c_uint8(self.sound_timer.value - 1)
+    def run_cycles(self, count: int) -> int:
+        """Run up to count cycles, returning how many ran."""
+        return self.run_until(None, count)
+
+    def run_until(
+        self, predicate: Optional[Callable[["CPU"], bool]], max_cycles: int
+    ) -> int:
+        """Run cycles until predicate returns True or max_cycles have run.
+
+        Stops early, before executing the instruction at the program counter,
+        at a breakpoint, at an opcode that can't be decoded, at FX0A when no
+        key is pressed, or at a jump that spins idle (see idle_at). A
+        breakpoint at the program counter when called is executed, so a
+        stopped CPU can be resumed. Returns the number of cycles run, with
+        stop_reason set to why they stopped.
+        """
+        memory = self.memory.memory
+        table = self.decode_table
+        handlers = self.handlers
+        breakpoints = self.breakpoints
+        wait = OperationType.WAIT_FOR_KEY_PRESS
+        jump = OperationType.JUMP
+        count = 0
+
+        self.error = None
+        self.stop_reason = StopReason.CYCLES
+        while count < max_cycles:
+            if predicate is not None and predicate(self):
+                self.stop_reason = StopReason.PREDICATE
+                break
+
+            address = self.program_counter
+            if count and address in breakpoints:
+                self.stop_reason = StopReason.BREAKPOINT
+                break
+
+            try:
+                opcode = memory[address] << 8 | memory[address + 1]
+            except IndexError as e:
+                raise InvalidMemoryAddressError from e
+
+            instruction = table[opcode]
+            if instruction is None:
+                self.error = UnhandledOperationError(
+                    f"Unhandled operation for opcode: {hex(opcode)}",
+                    operation=Operation.decode(opcode),
+                )
+                self.stop_reason = StopReason.UNHANDLED_OPERATION
+                break
+
+            operation_type = instruction.type
+            if operation_type is wait and self.keycode is None:
+                self.stop_reason = StopReason.KEY_WAIT
+                break
+
+            if operation_type is jump:
+                idle = self.idle_at(address)
+                if idle is not None:
+                    self.stop_reason = idle
+                    break
+
+            self.program_counter = address + 2
+            handlers[operation_type](instruction)
+            count += 1
+
+        return count
+
+    def idle_at(self, address: int) -> Optional[StopReason]:
+        """Why the jump at address spins idle, or None if it doesn't.
+
+        Either the jump is to itself, or it loops back to poll the delay
+        timer while the timer is running:
+
+            Fx07  LD Vx, DT
+            3x00  SE Vx, 0
+            1nnn  JP nnn, back to the Fx07
+
+        Nothing changes until a key is pressed or the timer runs out.
+        """
+        memory = self.memory.memory
+        target = (memory[address] & 0xF) << 8 | memory[address + 1]
+        if target == address:
+            return StopReason.JUMP_TO_SELF
+
+        if target == address - 4 and self.delay_timer:
+            x = memory[target] & 0xF
+            if (
+                memory[target] == 0xF0 | x
+                and memory[target + 1] == 0x07
+                and memory[target + 2] == 0x30 | x
+                and memory[target + 3] == 0x00
+            ):
+                return StopReason.DELAY_WAIT
+
+        return None
+
+    def tick_timers(self, count: int = 1):
+        """Count the delay and sound timers down, stopping at zero."""
+        if self.delay_timer > 0:
+            self.delay_timer = max(self.delay_timer - count, 0)
+
+        if self.sound_timer > 0:
+            self.sound_timer = max(self.sound_timer - count, 0)
 
     def shutdown(self):
         """Called when backend emits QUIT event."""
         pass
 
     def __str__(self):
-        return f'{self.program_counter=}'
+        return f"{self.program_counter=}"
@@ -0,0 +1,52 @@
+"""Render decoded instructions as assembly, using Cowgod's mnemonics.
+
+http://devernay.free.fr/hacks/chip8/C8TECH10.HTM#3.1
+"""
+from typing import Optional
+
+from .cpu import Instruction, OperationType
+
+# fmt: off
+MNEMONICS = {
+    OperationType.CLEAR_SCREEN: "CLS",
+    OperationType.RETURN: "RET",
+    OperationType.JUMP: "JP {nnn:#05x}",
+    OperationType.CALL: "CALL {nnn:#05x}",
+    OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL: "SE V{x:X}, {nn:#04x}",
+    OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL: "SNE V{x:X}, {nn:#04x}",
+    OperationType.SKIP_IF_VX_AND_VY_ARE_EQUAL: "SE V{x:X}, V{y:X}",
+    OperationType.SET_REGISTER: "LD V{x:X}, {nn:#04x}",
+    OperationType.ADD: "ADD V{x:X}, {nn:#04x}",
+    OperationType.SET_VX: "LD V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VX_OR_VY: "OR V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VX_AND_VY: "AND V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VX_XOR_VY: "XOR V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VX_ADD_VY: "ADD V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VX_SUB_VY: "SUB V{x:X}, V{y:X}",
+    OperationType.SHIFT_VX_RIGHT: "SHR V{x:X}, V{y:X}",
+    OperationType.SET_VX_TO_VY_SUB_VX: "SUBN V{x:X}, V{y:X}",
+    OperationType.SHIFT_VX_LEFT: "SHL V{x:X}, V{y:X}",
+    OperationType.SKIP_IF_VX_AND_VY_ARE_NOT_EQUAL: "SNE V{x:X}, V{y:X}",
+    OperationType.SET_INDEX: "LD I, {nnn:#05x}",
+    OperationType.RANDOM: "RND V{x:X}, {nn:#04x}",
+    OperationType.DISPLAY: "DRW V{x:X}, V{y:X}, {n}",
+    OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_EQUAL: "SKP V{x:X}",
+    OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_NOT_EQUAL: "SKNP V{x:X}",
+    OperationType.WAIT_FOR_KEY_PRESS: "LD V{x:X}, K",
+    OperationType.SET_DELAY_TIMER_TO_VX: "LD DT, V{x:X}",
+    OperationType.SET_SOUND_TIMER_TO_VX: "LD ST, V{x:X}",
+    OperationType.SET_VX_TO_DELAY_TIMER: "LD V{x:X}, DT",
+    OperationType.ADD_VX_TO_INDEX: "ADD I, V{x:X}",
+    OperationType.FONT: "LD F, V{x:X}",
+    OperationType.STORE_BINARY_CODED_DECIMAL: "LD B, V{x:X}",
+    OperationType.LOAD_REGISTERS: "LD [I], V{x:X}",
+    OperationType.STORE_REGISTERS: "LD V{x:X}, [I]",
+}
+# fmt: on
+
+
+def disassemble(instruction: Optional[Instruction]) -> str:
+    """The assembly for instruction, or ??? if it couldn't be decoded."""
+    if instruction is None:
+        return "???"
+    return MNEMONICS[instruction.type].format(**instruction._asdict())
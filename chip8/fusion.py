@@ -0,0 +1,152 @@
+"""Superinstructions, fusing common sequences of instructions in to one handler.
+
+Fusion is a pass over the code of a translated block. Sequences fused are:
+
+ - ANNN, DXYN: set the index then draw a sprite from it.
+ - 6XNN, 6XNN, ...: consecutive register loads.
+ - 7XNN, 3XNN or 4XNN, 1NNN: a counter loop, adding to a register then
+   jumping unless it's reached a value.
+"""
+from collections import Counter
+
+from .cpu import Instruction, OperationType, decode_table
+from .memory import InvalidMemoryAddressError
+from .translator import BlockCPU, Code, Superinstruction
+
+COUNTER_SKIPS = frozenset(
+    [
+        OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL,
+    ]
+)
+
+
+def fuse(memory, code: Code) -> Code:
+    """Replace fusable sequences of instructions with superinstructions."""
+    fused: Code = []
+    i = 0
+
+    while i < len(code):
+        address, instruction = code[i]
+        following = code[i + 1][1] if i + 1 < len(code) else None
+
+        if (
+            instruction.type == OperationType.SET_INDEX
+            and following is not None
+            and following.type == OperationType.DISPLAY
+        ):
+            fused.append(
+                (
+                    address,
+                    Superinstruction(
+                        type=OperationType.DISPLAY,
+                        handler="execute_set_index_and_display",
+                        instructions=(instruction, following),
+                    ),
+                )
+            )
+            i += 2
+            continue
+
+        if instruction.type == OperationType.SET_REGISTER:
+            end = i
+            while end < len(code) and code[end][1].type == OperationType.SET_REGISTER:
+                end += 1
+
+            if end - i > 1:
+                fused.append(
+                    (
+                        address,
+                        Superinstruction(
+                            type=OperationType.SET_REGISTER,
+                            handler="execute_set_registers",
+                            instructions=tuple(op for _, op in code[i:end]),
+                        ),
+                    )
+                )
+                i = end
+                continue
+
+        # The skip ends the block, so the jump following it is read directly.
+        if (
+            instruction.type == OperationType.ADD
+            and i + 2 == len(code)
+            and following.type in COUNTER_SKIPS
+            and following.x == instruction.x
+        ):
+            try:
+                jump = decode_table()[memory[address + 4] << 8 | memory[address + 5]]
+            except InvalidMemoryAddressError:
+                jump = None
+
+            if jump is not None and jump.type == OperationType.JUMP:
+                fused.append(
+                    (
+                        address,
+                        Superinstruction(
+                            type=OperationType.JUMP,
+                            handler="execute_count_and_jump",
+                            instructions=(instruction, following, jump),
+                            variable=True,
+                        ),
+                    )
+                )
+                break
+
+        fused.append((address, instruction))
+        i += 1
+
+    return fused
+
+
+class FusedCPU(BlockCPU):
+    """A block translating CPU which fuses common instruction sequences.
+
+    Counts how many instructions were executed by each kind of
+    superinstruction, reported on shutdown.
+    """
+
+    passes = (fuse,)
+
+    def __init__(self, memory, display, registers):
+        super().__init__(memory, display, registers)
+        self.fused: Counter = Counter()
+
+    def execute_set_index_and_display(self, index: Instruction, display: Instruction):
+        self.fused["set_index_and_display"] += 2
+        self.index = index.nnn
+        self.execute_display(display)
+
+    def execute_set_registers(self, *operations: Instruction):
+        self.fused["set_registers"] += len(operations)
+        v = self.v
+        for operation in operations:
+            v[operation.x] = operation.nn
+
+    def execute_count_and_jump(
+        self, add: Instruction, skip: Instruction, jump: Instruction
+    ) -> int:
+        """Returns 2 if the skip was taken, otherwise 3 as the jump executes.
+
+        The program counter is expected to already point past the jump.
+        """
+        self.execute_add(add)
+
+        value = self.v[add.x]
+        if skip.type == OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL:
+            skipped = value == skip.nn
+        else:
+            skipped = value != skip.nn
+
+        if skipped:
+            self.fused["count_and_jump"] += 2
+            return 2
+
+        self.program_counter = jump.nnn
+        self.fused["count_and_jump"] += 3
+        return 3
+
+    def shutdown(self):
+        """Output how many instructions were fused."""
+        print(f"Fused instructions: {sum(self.fused.values())} {dict(self.fused)}")
+        super().shutdown()
@@ -0,0 +1,91 @@
+"""Fixed memory histograms for recording timings, in the style of HdrHistogram.
+
+Values are bucketed by their power of two, and each power of two is split in
+to 2 ** precision linear sub-buckets. Every value is recorded to within a
+relative error of 1 / 2 ** precision, however large, using the same fixed
+number of counts.
+"""
+from typing import Dict, List, Optional
+
+# Largest value recordable is 2 ** BITS - 1, ample for nanoseconds.
+BITS = 64
+
+
+class Histogram:
+    def __init__(self, precision: int = 5):
+        self.precision = precision
+        self.sub_buckets = 1 << precision
+        self.counts: List[int] = [0] * ((BITS - precision + 1) * self.sub_buckets)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def index(self, value: int) -> int:
+        """Bucket index of value.
+
+        Values below 2 ** (precision + 1) have a bucket each, above that
+        buckets double in width with each power of two.
+        """
+        shift = value.bit_length() - self.precision - 1
+        if shift <= 0:
+            return value
+        return shift * self.sub_buckets + (value >> shift)
+
+    def highest(self, index: int) -> int:
+        """Largest value recorded in to the bucket at index."""
+        if index < 2 * self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        return ((index - shift * self.sub_buckets + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Record a non-negative int, such as a duration in nanoseconds."""
+        self.counts[self.index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float) -> int:
+        """Value which percentile percent of recorded values are at or below."""
+        if not self.count:
+            return 0
+
+        target = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.highest(index), self.max)
+
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max or 0,
+        }
+
+    def __str__(self):
+        summary = self.summary()
+        return " ".join(
+            f"{key}={value:.0f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in summary.items()
+        )
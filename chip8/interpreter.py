@@ -1,11 +1,23 @@
-from typing import Optional
+from typing import List, Optional
 
 import enum
+import time
 
 from .backends.base import Backend
 from .backends.events import EventType
-from .cpu import FONT_ADDRESS_START, FONT_ADDRESS_END
-from .fonts import Font
+from .cpu import FONT_ADDRESS_START, StopReason
+from .profiler import FrameProfiler
+
+# Address ROMs are loaded in to memory from
+PROGRAM_START = 0x200
+
+# Frames per second. Timers count down, events are polled and the display is
+# presented once per frame.
+FRAME_RATE = 60
+
+# Reasons the CPU stops early for which it would spin through the rest of its
+# frame without changing anything.
+IDLE = frozenset([StopReason.KEY_WAIT, StopReason.JUMP_TO_SELF, StopReason.DELAY_WAIT])
 
 
 class Keyboard(enum.Enum):
@@ -71,43 +83,64 @@ class DebugBindings(enum.Enum):
     NEXT = 1073741887  # F6
     LOG = 1073741888  # F7
     CONTINUE = 1073741889  # F8
+    HUD = 1073741890  # F9
 
 
 class Interpreter:
     """The interpreter ties together the CPU with the game backend.
 
     Responsible for setting up the initial environment and running the both the
-    event loop and executing a CPU cycle.
+    event loop and executing CPU cycles. The backend should throttle to
+    FRAME_RATE, with instructions_per_frame cycles executed each frame.
+
+    Frame profilers are told when each phase of a frame ends: throttle, poll,
+    cpu and update.
+
+    When the CPU idles the rest of its frame is spent throttling, and any
+    following frames it would idle through are skipped if the backend can.
     """
 
-    def __init__(self, backend: Backend, cpu):
+    def __init__(
+        self,
+        backend: Backend,
+        cpu,
+        instructions_per_frame: int = 8,
+        frame_profilers: Optional[List[FrameProfiler]] = None,
+    ):
         self.backend = backend
         self.cpu = cpu
+        self.instructions_per_frame = instructions_per_frame
+        self.frame_profilers: List[FrameProfiler] = frame_profilers or []
+        # Frames cut short by the CPU idling, frames skipped while it idled
+        # and the instructions it would have spun through in them.
+        self.idle_frames = 0
+        self.skipped_frames = 0
+        self.idle_instructions = 0
+        # Instructions executed, and nanoseconds spent executing them
+        self.executed = 0
+        self.executing = 0
 
     def boot(self):
         """Load system fonts into memory."""
-        fonts = Font.__members__.values()
-        for font, location in zip(
-            fonts, range(FONT_ADDRESS_START, FONT_ADDRESS_END, 5)
-        ):
-            self.cpu.memory[location : location + 5] = font.value
+        self.cpu.load_font(FONT_ADDRESS_START)
 
     def load_rom(self, path):
         """Load a ROM file into memory."""
         with open(path, "rb") as f:
-            rom = f.read()
-            for instruction, location in zip(rom, range(0x200, 0xFFF)):
-                self.cpu.memory[location] = instruction
+            rom = f.read(len(self.cpu.memory) - PROGRAM_START)
+        self.cpu.memory[PROGRAM_START : PROGRAM_START + len(rom)] = rom
 
     def run(self):
-        """Start the event loop and execute CPU cycle."""
+        """Start the event loop, executing a frame of CPU cycles per iteration."""
         running = True
         paused = False
 
         while running:
             debug_next_step = False
 
+            start = time.perf_counter_ns()
             self.backend.throttle()
+            frame_start = self.span("throttle", start)
 
             for event in self.backend.get():
                 if event.type == EventType.KEYDOWN:
@@ -122,6 +155,9 @@ class Interpreter:
                         print(f"{self.cpu}")
                     elif event.keycode == DebugBindings.CONTINUE.value:
                         paused = False
+                    elif event.keycode == DebugBindings.HUD.value:
+                        for profiler in self.frame_profilers:
+                            profiler.toggle()
 
                 if event.type == EventType.KEYUP:
                     self.cpu.keycode = None
@@ -129,8 +165,81 @@ class Interpreter:
                     running = False
                     self.cpu.shutdown()
 
+            self.span("poll", frame_start)
+            if not running:
+                break
+
+            executed = 0
             if not paused:
-                self.cpu.cycle()
+                instructions = 1 if debug_next_step else self.instructions_per_frame
+                executed = self.frame(instructions)
+                if self.cpu.stop_reason in IDLE:
+                    self.idle(instructions - executed)
 
             if debug_next_step:
                 paused = True
+
+            if self.frame_profilers:
+                end = time.perf_counter_ns()
+                for profiler in self.frame_profilers:
+                    profiler.frame(frame_start, end, executed)
+
+        for profiler in self.frame_profilers:
+            profiler.stop()
+
+    def frame(self, instructions: int) -> int:
+        """Execute a frame's instructions, tick the timers and present.
+
+        Instructions stop early if the CPU waits for a key or otherwise
+        idles, the rest of the frame is spent idle. Returns the number of
+        instructions executed.
+        """
+        start = time.perf_counter_ns()
+        executed = self.cpu.run_cycles(instructions)
+        if self.cpu.stop_reason == StopReason.UNHANDLED_OPERATION:
+            raise self.cpu.error
+        executed_at = self.span("cpu", start)
+        self.executed += executed
+        self.executing += executed_at - start
+
+        self.cpu.tick_timers()
+        self.cpu.display.update()
+        self.span("update", executed_at)
+
+        return executed
+
+    def idle(self, remaining: int):
+        """Count a frame cut short by the CPU idling, with remaining
+        instructions unrun, and skip the frames it will idle through next.
+
+        Polling the delay timer idles until the timer runs out, anything else
+        until the next event.
+        """
+        self.idle_frames += 1
+        self.idle_instructions += remaining
+
+        cpu = self.cpu
+        frames = cpu.delay_timer if cpu.stop_reason == StopReason.DELAY_WAIT else None
+        skipped = self.backend.skip(frames)
+        if skipped:
+            cpu.tick_timers(skipped)
+            self.skipped_frames += skipped
+            self.idle_instructions += skipped * self.instructions_per_frame
+
+    def idle_report(self) -> str:
+        """How much idling was avoided, with the time it would have taken."""
+        per_instruction = self.executing / self.executed if self.executed else 0
+        saved = self.idle_instructions * per_instruction / 1e9
+        return (
+            f"Idle: {self.idle_frames} frames cut short, "
+            f"{self.skipped_frames} skipped, "
+            f"{self.idle_instructions:,} instructions not run "
+            f"saving about {saved:.3f}s"
+        )
+
+    def span(self, name: str, start: int) -> int:
+        """Report a phase of the frame from start to now, returning now."""
+        end = time.perf_counter_ns()
+        for profiler in self.frame_profilers:
+            profiler.span(name, start, end)
+        return end
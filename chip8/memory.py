@@ -1,4 +1,5 @@
-from ctypes import c_uint8
+from typing import Union
+
 
 class InvalidMemoryAddressError(Exception):
     """Exception raised if invalid memory address is accessed or mutated."""
@@ -7,9 +8,9 @@ class InvalidMemoryAddressError(Exception):
 class Memory:
     """The RAM of the Chip-8 intepretor.
 
-    Creates an empty list of 4KB. Subscription used to access memory with
-    InvalidMemoryAddressError raised if attempt is made to access memory
-    outside of the bounds of RAM.
+    Creates an empty bytearray of 4KB, or size if given. Subscription used to
+    access memory with InvalidMemoryAddressError raised if attempt is made to
+    access memory outside of the bounds of RAM.
 
     From the spec:
 
@@ -49,19 +50,48 @@ class Memory:
     """
 
     def __init__(self, size=4096):
-        self.memory: list = [0x0] * size
+        self.memory = bytearray(size)
+        # Slices are returned as views of memory to avoid copying
+        self.view = memoryview(self.memory)
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def check(self, addresses: slice):
+        """Raise InvalidMemoryAddressError if a slice runs outside of memory.
+
+        Slicing a bytearray silently truncates out of range slices.
+        """
+        start, stop = addresses.start or 0, addresses.stop
+        if start < 0 or (stop is not None and stop > len(self.memory)):
+            raise InvalidMemoryAddressError
 
-    def __getitem__(self, address: int) -> c_uint8:
-        """Fetch item at address or raise InvalidMemoryAddressError."""
+    def __getitem__(self, address: Union[int, slice]) -> Union[int, memoryview]:
+        """Fetch item at address or raise InvalidMemoryAddressError.
+
+        Slices return a memoryview onto memory rather than a copy.
+        """
+        if isinstance(address, slice):
+            self.check(address)
+            return self.view[address]
         try:
             return self.memory[address]
         except IndexError as e:
             raise InvalidMemoryAddressError from e
 
-    def __setitem__(self, address: int, value: c_uint8):
-        """Set item at address or raise InvalidMemoryAddressError."""
+    def __setitem__(self, address: Union[int, slice], value):
+        """Set item at address or raise InvalidMemoryAddressError.
+
+        Slices may be set from any bytes-like object or sequence of ints of the
+        same length.
+        """
+        if isinstance(address, slice):
+            self.check(address)
+            if not isinstance(value, (bytes, bytearray, memoryview)):
+                value = bytes(value)
+            self.view[address] = value
+            return
         try:
             self.memory[address] = value
         except IndexError as e:
             raise InvalidMemoryAddressError from e
-
@@ -0,0 +1,186 @@
+"""Serve live emulator metrics in the OpenMetrics text format.
+
+MetricsProfiler is a FrameProfiler collecting frame, render and event poll
+timings. serve exposes it, and optionally per operation counts from an
+OperationProfiler, over localhost HTTP or a Unix socket from a daemon thread.
+Scrapes only read the profilers' counters, so never block the emulator.
+
+https://github.com/OpenObservability/OpenMetrics/blob/main/specification/OpenMetrics.md
+"""
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from .histogram import Histogram
+from .profiler import FrameProfiler, OperationProfiler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+QUANTILES = (50, 90, 99)
+
+
+class MetricsProfiler(FrameProfiler):
+    """Count instructions and frames, and time each phase of a frame.
+
+    A frame is dropped if it took longer than its share of a second at
+    frame_rate, not counting time spent throttling.
+    """
+
+    def __init__(self, frame_rate: int = 60):
+        self.budget = 1_000_000_000 // frame_rate
+        self.instructions = 0
+        self.frames = 0
+        self.dropped = 0
+        self.frame_time = Histogram()
+        self.spans = {
+            name: Histogram() for name in ("throttle", "poll", "cpu", "update")
+        }
+        # Instructions per second over the last second
+        self.rate = 0.0
+        self.second = time.perf_counter_ns()
+        self.second_instructions = 0
+
+    def span(self, name: str, start: int, end: int):
+        self.spans[name].record(end - start)
+
+    def frame(self, start: int, end: int, instructions: int):
+        elapsed = end - start
+        self.frames += 1
+        self.instructions += instructions
+        self.frame_time.record(elapsed)
+        if elapsed > self.budget:
+            self.dropped += 1
+
+        self.second_instructions += instructions
+        if end - self.second >= 1_000_000_000:
+            self.rate = self.second_instructions * 1e9 / (end - self.second)
+            self.second = end
+            self.second_instructions = 0
+
+    def stop(self):
+        pass
+
+
+def summary(name: str, help: str, histogram: Histogram) -> List[str]:
+    """A summary metric in seconds from a histogram of nanoseconds."""
+    lines = [
+        f"# TYPE {name} summary",
+        f"# UNIT {name} seconds",
+        f"# HELP {name} {help}",
+    ]
+    for quantile in QUANTILES:
+        value = histogram.percentile(quantile) / 1e9
+        lines.append(f'{name}{{quantile="{quantile / 100}"}} {value}')
+    lines.append(f"{name}_sum {histogram.total / 1e9}")
+    lines.append(f"{name}_count {histogram.count}")
+    return lines
+
+
+def exposition(
+    profiler: MetricsProfiler, operations: Optional[OperationProfiler] = None
+) -> str:
+    """The metrics in OpenMetrics text format."""
+    lines = [
+        "# TYPE chip8_instructions counter",
+        "# HELP chip8_instructions Instructions executed.",
+        f"chip8_instructions_total {profiler.instructions}",
+        "# TYPE chip8_instructions_per_second gauge",
+        "# HELP chip8_instructions_per_second Instructions executed over the last second.",
+        f"chip8_instructions_per_second {profiler.rate}",
+        "# TYPE chip8_frames counter",
+        "# HELP chip8_frames Frames run.",
+        f"chip8_frames_total {profiler.frames}",
+        "# TYPE chip8_dropped_frames counter",
+        "# HELP chip8_dropped_frames Frames which took longer than the frame rate allows.",
+        f"chip8_dropped_frames_total {profiler.dropped}",
+    ]
+    lines += summary(
+        "chip8_frame_seconds",
+        "Time to run a frame, not counting throttling.",
+        profiler.frame_time,
+    )
+    lines += summary(
+        "chip8_render_seconds",
+        "Time to present the display.",
+        profiler.spans["update"],
+    )
+    lines += summary(
+        "chip8_poll_seconds",
+        "Time to poll the backend for events.",
+        profiler.spans["poll"],
+    )
+
+    if operations is not None:
+        lines.append("# TYPE chip8_operations counter")
+        lines.append("# HELP chip8_operations Instructions executed by OperationType.")
+        for operation_type, count in sorted(
+            operations.counts.items(), key=lambda item: item[0].name
+        ):
+            lines.append(
+                f'chip8_operations_total{{type="{operation_type.name}"}} {count}'
+            )
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves on a Unix socket path, removing the socket file when closed."""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        # A socket file left behind by a previous run can't be bound to
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def serve(
+    profiler: MetricsProfiler,
+    operations: Optional[OperationProfiler] = None,
+    port: Optional[int] = None,
+    path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Serve metrics on a localhost port, or Unix socket path, in the background.
+
+    Returns the server, call shutdown then server_close on it to stop
+    serving.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = exposition(profiler, operations).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self):
+            # Unix socket clients have no address
+            return str(self.client_address or "unix")
+
+        def log_message(self, format, *args):
+            pass
+
+    if path is not None:
+        server = UnixHTTPServer(path, Handler)
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port or 0), Handler)
+        server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
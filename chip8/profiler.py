@@ -1,53 +1,512 @@
+import json
+import os
+import sys
+import threading
 import time
-from typing import List, Optional, Protocol
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from .backends.base import HEIGHT, WIDTH, Renderable, Sprite
+from .cpu import CPU, Instruction, OperationType, StopReason
+from .disassembler import disassemble
+from .histogram import Histogram
 
 
 class Profiler(Protocol):
+    # Set to have executed called for every instruction. Block translating
+    # CPUs are then run an instruction at a time by the interpreter.
+    per_instruction: bool = False
+    # Clear if cycle needn't be called, letting the CPU run uninterrupted.
+    per_cycle: bool = True
+
+    def attach(self, cpu):
+        """Called with the CPU being profiled, before any cycles run."""
+
     def cycle(self):
         """Collect profile data. Called once per CPU cycle."""
 
+    def stop(self):
+        """Stop collecting, called before results are output."""
+
+    def executed(self, address: int, instruction: Instruction, elapsed: int):
+        """Collect profile data for an instruction that took elapsed ns."""
+
     def __str__(self):
         """Output profile results."""
 
 
+class WindowedHistogram:
+    """A histogram of all values and of the current window of time.
+
+    Every window seconds the window's summary is kept as a snapshot and the
+    window restarts. Only the latest snapshots are kept.
+    """
+
+    def __init__(self, window: float = 10.0, snapshots: int = 60):
+        self.window = window
+        self.total = Histogram()
+        self.current = Histogram()
+        self.snapshots: Deque[dict] = deque(maxlen=snapshots)
+        self.started = time.perf_counter()
+
+    def record(self, value: int, now: float):
+        self.total.record(value)
+        self.current.record(value)
+        if now - self.started >= self.window:
+            self.snapshots.append({"time": now, **self.current.summary()})
+            self.current.reset()
+            self.started = now
+
+    def to_json(self) -> dict:
+        return {"total": self.total.summary(), "windows": list(self.snapshots)}
+
+
+class FrameProfiler(Protocol):
+    """Profile the phases of each frame run by the Interpreter.
+
+    Times are from time.perf_counter_ns.
+    """
+
+    def span(self, name: str, start: int, end: int):
+        """Called as each phase of a frame ends."""
+
+    def frame(self, start: int, end: int, instructions: int):
+        """Called as each frame ends, with the instructions it executed.
+
+        Frames start once the backend has finished throttling.
+        """
+
+    def stop(self):
+        """Called when the interpreter stops running."""
+
+    def toggle(self):
+        """Called when the HUD debug key is pressed, to show or hide output."""
+
+
 class CPUFrequencyProfiler(Profiler):
-    """Profile how many cycles are performed per second."""
-    def __init__(self):
-        self.timings = {}
+    """Profile how many cycles are performed per second.
+
+    Seconds are counted from the first cycle, so start up isn't included.
+    The final partial second is recorded on stop, scaled to a whole second.
+    """
+
+    def __init__(self, window: float = 10.0):
+        self.histogram = WindowedHistogram(window)
         self.count = 0
-        self.tick = None
+        # When the current second started, set by the first cycle
+        self.started: Optional[float] = None
 
     def cycle(self):
-        now = int(time.time())
-        if self.tick != now:
-            self.tick = now
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        elif now - self.started >= 1:
+            self.histogram.record(self.count, now)
+            self.started = now
             self.count = 0
-        self.timings[now] = self.count
         self.count += 1
 
+    def stop(self):
+        now = time.perf_counter()
+        if self.count and self.started is not None and now > self.started:
+            self.histogram.record(round(self.count / (now - self.started)), now)
+            self.count = 0
+
+    def to_json(self) -> dict:
+        return self.histogram.to_json()
+
     def __str__(self):
-        return f"CPU frequency: {self.timings}"
+        return f"CPU frequency (cycles/s): {self.histogram.total}"
 
 
 class CPUTimingProfiler(Profiler):
-    """Profile long each cycle takes to execute."""
-    def __init__(self):
-        self.profile = []
-        self.tick = 0
+    """Profile long each cycle takes to execute, in nanoseconds."""
+
+    def __init__(self, window: float = 10.0):
+        self.histogram = WindowedHistogram(window)
+        self.tick: Optional[int] = None
 
     def cycle(self):
-        now = time.perf_counter()
-        self.profile.append(int((now - self.tick) * 1000))
+        now = time.perf_counter_ns()
+        if self.tick is not None:
+            self.histogram.record(now - self.tick, now / 1e9)
         self.tick = now
 
+    def to_json(self) -> dict:
+        return self.histogram.to_json()
+
+    def __str__(self):
+        return f"CPU timings (ns): {self.histogram.total}"
+
+
+class OperationProfiler(Profiler):
+    """Profile how many times each OperationType executes and the time in each."""
+
+    per_instruction = True
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        # Nanoseconds spent executing each OperationType
+        self.elapsed: Counter = Counter()
+
+    def executed(self, address: int, instruction: Instruction, elapsed: int):
+        self.counts[instruction.type] += 1
+        self.elapsed[instruction.type] += elapsed
+
+    def to_json(self) -> dict:
+        """OperationTypes by name, sorted by the time spent in each."""
+        return {
+            operation_type.name: {
+                "count": self.counts[operation_type],
+                "ns": elapsed,
+            }
+            for operation_type, elapsed in self.elapsed.most_common()
+        }
+
+    def __str__(self):
+        total = sum(self.elapsed.values()) or 1
+        lines = [
+            "Operations:",
+            f"{'type':>40} {'count':>10} {'ms':>10} {'ns/op':>8} {'time':>6}",
+        ]
+        for operation_type, elapsed in self.elapsed.most_common():
+            count = self.counts[operation_type]
+            lines.append(
+                f"{operation_type.name:>40} {count:>10} {elapsed / 1e6:>10.1f} "
+                f"{elapsed / count:>8.0f} {elapsed / total:>6.1%}"
+            )
+        return "\n".join(lines)
+
+
+class AddressProfiler(Profiler):
+    """Profile executions per address, data accesses per address and calls.
+
+    Data reads are by DXYN and FX65, writes by FX33 and FX55. Calls are
+    tracked with a stack of subroutine addresses, mirroring CPU.stack, and
+    every instruction is counted against the stack it executed in.
+    """
+
+    per_instruction = True
+
+    def __init__(self):
+        self.executions: Counter = Counter()
+        self.reads: Counter = Counter()
+        self.writes: Counter = Counter()
+        # Instructions executed in each stack of subroutine addresses
+        self.stacks: Counter = Counter()
+        self.stack: Tuple[int, ...] = ()
+        self.cpu = None
+
+    def attach(self, cpu):
+        self.cpu = cpu
+
+    def executed(self, address: int, instruction: Instruction, elapsed: int):
+        self.executions[address] += 1
+
+        if not self.stack:
+            # The first instruction executed is the root of every stack
+            self.stack = (address,)
+        self.stacks[self.stack] += 1
+
+        operation_type = instruction.type
+        if operation_type == OperationType.CALL:
+            self.stack += (instruction.nnn,)
+        elif operation_type == OperationType.RETURN:
+            if len(self.stack) > 1:
+                self.stack = self.stack[:-1]
+        elif operation_type in ACCESSES:
+            index = self.cpu.index
+            counter = self.writes if operation_type in WRITES else self.reads
+            counter.update(range(index, index + ACCESSES[operation_type](instruction)))
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph tools."""
+        return "\n".join(
+            f"{';'.join(f'{address:#05x}' for address in stack)} {count}"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+    def disassembly(self) -> str:
+        """Every executed address, its assembly and execution count."""
+        return annotate(self.cpu, sorted(self.executions.items()))
+
+    def to_json(self) -> dict:
+        return {
+            "executions": {f"{a:#05x}": n for a, n in sorted(self.executions.items())},
+            "reads": {f"{a:#05x}": n for a, n in sorted(self.reads.items())},
+            "writes": {f"{a:#05x}": n for a, n in sorted(self.writes.items())},
+            "stacks": self.collapsed().splitlines(),
+            "disassembly": self.disassembly().splitlines(),
+        }
+
+    def __str__(self):
+        return "Hottest addresses:\n" + annotate(
+            self.cpu, self.executions.most_common(20)
+        )
+
+
+def annotate(cpu, counts: Iterable[Tuple[int, int]]) -> str:
+    """Disassemble each address in counts, followed by its count."""
+    memory = cpu.memory.memory
+    table = cpu.decode_table
+    lines = []
+    for address, count in counts:
+        opcode = memory[address] << 8 | memory[address + 1]
+        lines.append(
+            f"{address:#05x}  {opcode:04X}  {disassemble(table[opcode]):<20}{count:>10}"
+        )
+    return "\n".join(lines)
+
+
+# Number of bytes of memory accessed from the index register by each operation
+ACCESSES: Dict[OperationType, Callable[[Instruction], int]] = {
+    OperationType.DISPLAY: lambda instruction: instruction.n,
+    OperationType.STORE_REGISTERS: lambda instruction: instruction.x + 1,
+    OperationType.LOAD_REGISTERS: lambda instruction: instruction.x + 1,
+    OperationType.STORE_BINARY_CODED_DECIMAL: lambda instruction: 3,
+}
+WRITES = frozenset(
+    [OperationType.LOAD_REGISTERS, OperationType.STORE_BINARY_CODED_DECIMAL]
+)
+
+
+def throttling(frame) -> bool:
+    """Whether a sampled stack is in a backend's throttle, idling."""
+    while frame is not None:
+        if frame.f_code.co_name == "throttle":
+            return True
+        frame = frame.f_back
+    return False
+
+
+class SamplingProfiler(Profiler):
+    """Sample the program counter from a background thread at a fixed rate.
+
+    Unlike the per instruction profilers the CPU runs as normal, so overhead
+    is bounded by the sampling rate rather than the instruction rate. Each
+    sample records the guest address, its OperationType and the host Python
+    function the emulator was in. OperationTypes are reported as by
+    OperationProfiler, with time estimated from the sampling interval.
+    Samples taken while the backend throttles are counted as idle instead.
+    """
+
+    per_cycle = False
+
+    def __init__(self, rate: int = 1000):
+        self.interval = 1 / rate
+        self.operations = OperationProfiler()
+        self.addresses: Counter = Counter()
+        self.frames: Counter = Counter()
+        self.samples = 0
+        # Samples taken while throttling between frames
+        self.idle = 0
+        self.cpu = None
+        self.running = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def attach(self, cpu):
+        """Start sampling the calling thread running cpu."""
+        self.cpu = cpu
+        self.target = threading.get_ident()
+        self.running.set()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running.is_set():
+            time.sleep(self.interval)
+            self.sample()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.target)
+        self.samples += 1
+        if throttling(frame):
+            self.idle += 1
+            return
+
+        cpu = self.cpu
+        memory = cpu.memory.memory
+        address = cpu.program_counter
+        try:
+            instruction = cpu.decode_table[memory[address] << 8 | memory[address + 1]]
+        except IndexError:
+            instruction = None
+
+        self.addresses[address] += 1
+        if instruction is not None:
+            self.operations.executed(address, instruction, int(self.interval * 1e9))
+
+        if frame is not None:
+            code = frame.f_code
+            self.frames[
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+            ] += 1
+
+    def stop(self):
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+
+    def to_json(self) -> dict:
+        return {
+            "samples": self.samples,
+            "idle": self.idle,
+            "interval": self.interval,
+            "operations": self.operations.to_json(),
+            "addresses": {f"{a:#05x}": n for a, n in sorted(self.addresses.items())},
+            "frames": dict(self.frames.most_common()),
+        }
+
+    def __str__(self):
+        lines = [
+            f"Samples: {self.samples} every {self.interval * 1000:.1f}ms, "
+            f"{self.idle} idle throttling",
+            str(self.operations),
+            "Hottest addresses:",
+            annotate(self.cpu, self.addresses.most_common(20)),
+            "Hottest host frames:",
+        ]
+        for frame, count in self.frames.most_common(10):
+            lines.append(f"{frame:>60} {count:>10}")
+        return "\n".join(lines)
+
+
+class DisplayProfiler(Profiler, Renderable):
+    """Profile a display's sprite draws, clears and updates.
+
+    Wraps display, or the CPU's display when attached, passing everything
+    through to it. Calls, pixels touched, collisions and nanoseconds are
+    counted for each method, and reported per second.
+    """
+
+    per_cycle = False
+
+    def __init__(self, display: Optional[Renderable] = None, snapshots: int = 60):
+        self.display = display
+        self.totals = self.counters()
+        self.current = self.counters()
+        # Counts for each second, the latest kept
+        self.seconds: Deque[dict] = deque(maxlen=snapshots)
+        self.started = self.second = time.perf_counter_ns()
+        self.elapsed = 0
+
+    @staticmethod
+    def counters() -> Dict[str, Counter]:
+        return {method: Counter() for method in ("draw_sprite", "clear", "update")}
+
+    def attach(self, cpu):
+        """Profile cpu's display, in its place."""
+        if self.display is None:
+            self.display = cpu.display
+        cpu.display = self
+
+    def record(self, method: str, start: int, end: int, pixels: int, collision=False):
+        counter = self.current[method]
+        counter["calls"] += 1
+        counter["pixels"] += pixels
+        counter["collisions"] += collision
+        counter["ns"] += end - start
+
+    def draw_sprite(self, sprite: Sprite, x: int, y: int) -> bool:
+        start = time.perf_counter_ns()
+        collision = self.display.draw_sprite(sprite, x, y)
+        pixels = sum(line.bit_count() for line in sprite)
+        self.record("draw_sprite", start, time.perf_counter_ns(), pixels, collision)
+        return collision
+
+    def clear(self):
+        start = time.perf_counter_ns()
+        self.display.clear()
+        self.record("clear", start, time.perf_counter_ns(), WIDTH * HEIGHT)
+
+    def update(self):
+        # Framebuffers only present the dirty rows they take
+        dirty = getattr(self.display, "dirty", None)
+        before = HEIGHT if dirty is None else len(dirty)
+        start = time.perf_counter_ns()
+        self.display.update()
+        end = time.perf_counter_ns()
+        after = 0 if dirty is None else len(self.display.dirty)
+        self.record("update", start, end, (before - after) * WIDTH)
+        if end - self.second >= 1_000_000_000:
+            self.snapshot(end)
+
+    def snapshot(self, now: int):
+        """Keep the current second's counts and start the next."""
+        self.seconds.append(
+            {
+                "time": (now - self.started) / 1e9,
+                **{method: dict(counter) for method, counter in self.current.items()},
+            }
+        )
+        for method, counter in self.current.items():
+            self.totals[method].update(counter)
+        self.current = self.counters()
+        self.second = now
+        self.elapsed = now - self.started
+
+    def stop(self):
+        self.snapshot(time.perf_counter_ns())
+
+    def per_second(self) -> Dict[str, Dict[str, float]]:
+        """Mean of each count per second, with ns converted to ms."""
+        seconds = self.elapsed / 1e9 or 1.0
+        return {
+            method: {
+                "calls": counter["calls"] / seconds,
+                "pixels": counter["pixels"] / seconds,
+                "collisions": counter["collisions"] / seconds,
+                "ms": counter["ns"] / 1e6 / seconds,
+            }
+            for method, counter in self.totals.items()
+        }
+
+    def to_json(self) -> dict:
+        return {
+            "seconds": self.elapsed / 1e9,
+            "totals": {
+                method: dict(counter) for method, counter in self.totals.items()
+            },
+            "per_second": self.per_second(),
+            "windows": list(self.seconds),
+        }
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
     def __str__(self):
-        return f"CPU timings: {self.profile}"
+        lines = [
+            f"Display per second, over {self.elapsed / 1e9:.1f}s:",
+            f"{'method':>12} {'calls':>10} {'pixels':>12} {'collisions':>10} {'ms':>8}",
+        ]
+        for method, counts in self.per_second().items():
+            lines.append(
+                f"{method:>12} {counts['calls']:>10.1f} {counts['pixels']:>12.1f} "
+                f"{counts['collisions']:>10.1f} {counts['ms']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+
+# Profilers which can be chosen by name
+PROFILERS = {
+    "frequency": CPUFrequencyProfiler,
+    "timing": CPUTimingProfiler,
+    "operations": OperationProfiler,
+    "addresses": AddressProfiler,
+    "sampling": SamplingProfiler,
+    "display": DisplayProfiler,
+}
 
 
 class CPUProfiler:
     """Profile CPU cycles, shares interface with CPU to be passed to intepretor."""
 
-    def __init__(self, cpu, profilers: Optional[List[Profiler]] = None):
+    def __init__(
+        self,
+        cpu,
+        profilers: Optional[List[Profiler]] = None,
+        json_path: Optional[str] = None,
+    ):
         self.cpu = cpu
 
         if profilers is None:
@@ -56,6 +515,18 @@ class CPUProfiler:
                 CPUTimingProfiler(),
             ]
         self.profilers: List[Profiler] = profilers
+        for profiler in profilers:
+            profiler.attach(cpu)
+        self.instruction_profilers = [
+            p for p in profilers if getattr(p, "per_instruction", False)
+        ]
+        if self.instruction_profilers:
+            cpu.handlers = {
+                operation_type: self.timed(handler)
+                for operation_type, handler in cpu.handlers.items()
+            }
+        # Where profilers with a to_json method are written on shutdown
+        self.json_path = json_path
 
     def cycle(self):
         """Update profilers and pass through call to CPU."""
@@ -65,16 +536,169 @@ class CPUProfiler:
 
         self.cpu.cycle()
 
+    def run_cycles(self, count: int) -> int:
+        """Run up to count cycles, returning how many ran."""
+        return self.run_until(None, count)
+
+    def run_until(self, predicate, max_cycles: int) -> int:
+        """Pass through to the CPU's run_until, updating profilers per cycle.
+
+        Each call to the CPU runs a single cycle, or a single block for block
+        translating CPUs (see step), so profilers see the same cycles as with
+        cycle. If any profiler is per instruction, instructions are
+        interpreted one at a time so every handler is timed. If no profiler
+        is per cycle the CPU runs all of the cycles itself.
+        """
+        if self.instruction_profilers:
+            return self.run_instructions_until(predicate, max_cycles)
+
+        cpu = self.cpu
+        profilers = [p for p in self.profilers if getattr(p, "per_cycle", True)]
+        if not profilers:
+            return cpu.run_until(predicate, max_cycles)
+
+        breakpoints = cpu.breakpoints
+        count = 0
+
+        while count < max_cycles:
+            # Each call runs the instruction it starts at, breakpoint or not
+            if count and cpu.program_counter in breakpoints:
+                cpu.stop_reason = StopReason.BREAKPOINT
+                break
+
+            executed = cpu.run_until(predicate, self.step(max_cycles - count))
+            if not executed:
+                break
+
+            for profiler in profilers:
+                profiler.cycle()
+            count += executed
+
+        return count
+
+    def step(self, remaining: int) -> int:
+        """Cycles for the CPU to run in one call, at most remaining.
+
+        For block translating CPUs that's the length of the block at the
+        program counter, translating it if need be, so the block runs whole.
+        """
+        cpu = self.cpu
+        blocks = getattr(cpu, "blocks", None)
+        if blocks is None:
+            return 1
+
+        address = cpu.program_counter
+        block = blocks.get(address) or cpu.translate(address)
+        if block is None:
+            return 1
+        return min(remaining, (block.end - block.start) // 2)
+
+    def run_instructions_until(self, predicate, max_cycles: int) -> int:
+        """Interpret a cycle at a time, each timed by its handler."""
+        cpu = self.cpu
+        profilers = self.profilers
+        breakpoints = cpu.breakpoints
+        count = 0
+
+        while count < max_cycles:
+            if count and cpu.program_counter in breakpoints:
+                cpu.stop_reason = StopReason.BREAKPOINT
+                break
+
+            executed = CPU.run_until(cpu, predicate, 1)
+            if not executed:
+                break
+
+            for profiler in profilers:
+                profiler.cycle()
+            count += executed
+
+        return count
+
+    def timed(self, handler):
+        """Wrap an operation handler to report its timing to profilers."""
+        cpu = self.cpu
+        profilers = self.instruction_profilers
+        clock = time.perf_counter_ns
+
+        def execute(instruction: Instruction):
+            # The program counter has already moved past the instruction
+            address = cpu.program_counter - 2
+            start = clock()
+            handler(instruction)
+            elapsed = clock() - start
+            for profiler in profilers:
+                profiler.executed(address, instruction, elapsed)
+
+        return execute
+
     @property
     def memory(self):
         """Pass through call to fetch CPU's memory."""
         return self.cpu.memory
 
+    @property
+    def display(self):
+        """Pass through call to fetch CPU's display."""
+        return self.cpu.display
+
+    def tick_timers(self, *args, **kwargs):
+        """Pass through call to tick the CPU's timers."""
+        self.cpu.tick_timers(*args, **kwargs)
+
+    @property
+    def keycode(self):
+        """Pass through the CPU's pressed key."""
+        return self.cpu.keycode
+
+    @keycode.setter
+    def keycode(self, keycode):
+        self.cpu.keycode = keycode
+
+    @property
+    def delay_timer(self):
+        """Pass through the CPU's delay timer."""
+        return self.cpu.delay_timer
+
+    @property
+    def breakpoints(self):
+        """Pass through call to fetch CPU's breakpoints."""
+        return self.cpu.breakpoints
+
+    @property
+    def stop_reason(self):
+        """Pass through why the CPU's run_until last returned."""
+        return self.cpu.stop_reason
+
+    @property
+    def error(self):
+        """Pass through the error the CPU's run_until last stopped at."""
+        return self.cpu.error
+
+    def load_font(self, *args, **kwargs):
+        """Pass through call to load the CPU's font."""
+        self.cpu.load_font(*args, **kwargs)
+
     def shutdown(self):
         """Output profiler timings.
 
         Called when backend emits QUIT event."""
+        for profiler in self.profilers:
+            profiler.stop()
+
         for profiler in self.profilers:
             print(profiler)
 
+        if self.json_path:
+            with open(self.json_path, "w") as f:
+                json.dump(
+                    {
+                        type(profiler).__name__: profiler.to_json()
+                        for profiler in self.profilers
+                        if hasattr(profiler, "to_json")
+                    },
+                    f,
+                    indent=2,
+                )
+
         self.cpu.shutdown()
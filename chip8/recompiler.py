@@ -0,0 +1,176 @@
+"""Ahead-of-time recompiler, turning a ROM into a cached Python module.
+
+Code reachable from the entry point is split in to blocks, as used by the
+translator, and written out as a module with one function per block. The
+module is cached on disk keyed by a hash of the ROM so repeat runs of the same
+ROM skip translation entirely.
+
+Usage: python -m chip8.recompiler path/to/rom
+"""
+import argparse
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Union
+
+from .cpu import Instruction, OperationType
+from .memory import Memory
+from .translator import BLOCK_TERMINATORS, Block, BlockCPU, Code, emit, end_of, scan
+
+# Bump when the generated code changes to invalidate existing caches.
+VERSION = 5
+
+ENTRY_POINT = 0x200
+
+SKIPS = frozenset(
+    [
+        OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL,
+        OperationType.SKIP_IF_VX_AND_VY_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_VY_ARE_NOT_EQUAL,
+        OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_NOT_EQUAL,
+    ]
+)
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "chip8"
+
+
+def successors(address: int, instruction: Instruction) -> List[int]:
+    """Addresses execution may continue from after a block's last instruction.
+
+    Returns are resolved through the return address pushed by CALL, so they
+    have no successors of their own. FX0A, and blocks ending without a
+    terminator such as before FX0A, fall through to the following
+    instruction.
+    """
+    if instruction.type == OperationType.JUMP:
+        return [instruction.nnn]
+    if instruction.type == OperationType.CALL:
+        return [instruction.nnn, address + 2]
+    if instruction.type in SKIPS:
+        return [address + 2, address + 4]
+    if (
+        instruction.type == OperationType.WAIT_FOR_KEY_PRESS
+        or instruction.type not in BLOCK_TERMINATORS
+    ):
+        return [address + 2]
+    return []
+
+
+def discover(memory, entry: int = ENTRY_POINT) -> Dict[int, Code]:
+    """Walk the code reachable from entry, returning blocks by start address.
+
+    Addresses that don't decode to an instruction are left out, the
+    interpreter handles them if they're ever reached.
+    """
+    blocks: Dict[int, Code] = {}
+    pending = [entry]
+
+    while pending:
+        address = pending.pop()
+        if address in blocks:
+            continue
+
+        code = scan(memory, address)
+        if not code:
+            continue
+
+        blocks[address] = code
+        pending.extend(successors(*code[-1]))
+
+    return blocks
+
+
+def recompile(rom: bytes) -> str:
+    """Generate the source of a module containing a function per block."""
+    memory = Memory()
+    program = rom[: len(memory) - ENTRY_POINT]
+    memory[ENTRY_POINT : ENTRY_POINT + len(program)] = program
+
+    blocks = discover(memory)
+
+    lines = [
+        f'"""Recompiled from ROM {rom_hash(rom)}. Generated, do not edit."""',
+        "from chip8.cpu import decode_table",
+        "",
+        "D = decode_table()",
+        "",
+    ]
+    for address, code in sorted(blocks.items()):
+        lines.append("")
+        lines.append(emit(f"block_{address:03x}", code))
+
+    lines.append("")
+    lines.append("BLOCKS = {")
+    for address, code in sorted(blocks.items()):
+        end = end_of(code)
+        lines.append(f"    {address:#05x}: (block_{address:03x}, {end:#05x}),")
+    lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+
+def rom_hash(rom: bytes) -> str:
+    return hashlib.sha256(rom + f"v{VERSION}".encode()).hexdigest()
+
+
+def load(rom: bytes, cache_dir: Optional[Path] = None) -> ModuleType:
+    """Load the recompiled module for rom, recompiling it on a cache miss."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+
+    path = Path(cache_dir) / f"{rom_hash(rom)}.py"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never import a partial module.
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(recompile(rom))
+        os.replace(temporary, path)
+
+    spec = importlib.util.spec_from_file_location(f"chip8_rom_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def load_file(path: Union[str, Path], cache_dir: Optional[Path] = None):
+    """Load the recompiled module for the ROM file at path."""
+    with open(path, "rb") as f:
+        return load(f.read(), cache_dir)
+
+
+class CompiledCPU(BlockCPU):
+    """A CPU executing blocks from a recompiled ROM module.
+
+    Code the recompiler couldn't reach, and blocks invalidated by writes to
+    memory, are run by the interpreter one instruction per cycle.
+    """
+
+    def install(self, module: ModuleType):
+        """Cache the blocks from a module returned by load."""
+        for address, (run, end) in module.BLOCKS.items():
+            self.cache(Block(start=address, end=end, run=run))
+
+    def translate(self, address: int) -> Optional[Block]:
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=str, help="Path to rom file")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory to cache recompiled ROMs in",
+        default=default_cache_dir(),
+    )
+    args = parser.parse_args()
+
+    module = load_file(args.path, args.cache_dir)
+    print(f"{module.__file__}: {len(module.BLOCKS)} blocks")
@@ -0,0 +1,111 @@
+"""Write a timeline of each frame as Chrome trace events.
+
+The trace is streamed to a JSON array of complete ("X") events as the
+interpreter runs, for chrome://tracing or https://ui.perfetto.dev. Frames
+contain their throttle, poll, cpu and update phases, and sprite draws and
+clears are traced by wrapping the display in a TracedDisplay.
+
+https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+"""
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from .backends.base import Renderable, Sprite
+from .profiler import FrameProfiler
+
+
+class TraceProfiler(FrameProfiler):
+    """Stream frame phases to a trace file at path, closed on stop."""
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.file.write("[")
+        self.separator = "\n"
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.write(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": self.tid,
+                "args": {"name": "interpreter"},
+            }
+        )
+
+    def write(self, event: dict):
+        self.file.write(self.separator + json.dumps(event))
+        self.separator = ",\n"
+
+    def event(
+        self,
+        name: str,
+        category: str,
+        start: int,
+        end: int,
+        args: Optional[dict] = None,
+    ):
+        """Record a complete event from perf_counter_ns start to end."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self.pid,
+            "tid": self.tid,
+        }
+        if args:
+            event["args"] = args
+        self.write(event)
+
+    def span(self, name: str, start: int, end: int):
+        self.event(name, "interpreter", start, end)
+
+    def frame(self, start: int, end: int, instructions: int):
+        self.event("frame", "interpreter", start, end, {"instructions": instructions})
+
+    def stop(self):
+        if not self.file.closed:
+            self.file.write("\n]\n")
+            self.file.close()
+
+
+class TracedDisplay(Renderable):
+    """Trace sprite draws and clears of a display.
+
+    Anything else is passed through to the display being traced.
+    """
+
+    def __init__(self, display: Renderable, trace: TraceProfiler):
+        self.display = display
+        self.trace = trace
+
+    def draw_sprite(self, sprite: Sprite, x: int, y: int) -> bool:
+        start = time.perf_counter_ns()
+        collision = self.display.draw_sprite(sprite, x, y)
+        self.trace.event(
+            "draw_sprite",
+            "display",
+            start,
+            time.perf_counter_ns(),
+            {"x": x, "y": y, "height": len(sprite), "collision": collision},
+        )
+        return collision
+
+    def clear(self):
+        start = time.perf_counter_ns()
+        self.display.clear()
+        self.trace.event("clear", "display", start, time.perf_counter_ns())
+
+    def update(self):
+        self.display.update()
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    def __str__(self):
+        return str(self.display)
@@ -0,0 +1,304 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .cpu import CPU, Instruction, OperationType, StopReason, decode_table
+from .memory import InvalidMemoryAddressError
+
+# Instructions which may change the program counter. A block always ends
+# with one of these so the block's successor can't be known in advance.
+BLOCK_TERMINATORS = frozenset(
+    [
+        OperationType.RETURN,
+        OperationType.JUMP,
+        OperationType.CALL,
+        OperationType.SKIP_IF_VX_AND_NN_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_NN_ARE_NOT_EQUAL,
+        OperationType.SKIP_IF_VX_AND_VY_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_VY_ARE_NOT_EQUAL,
+        OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_EQUAL,
+        OperationType.SKIP_IF_VX_AND_KEYCODE_ARE_NOT_EQUAL,
+        OperationType.WAIT_FOR_KEY_PRESS,
+    ]
+)
+
+# Instructions that write to memory and so may modify translated code.
+MEMORY_WRITES = frozenset(
+    [
+        OperationType.LOAD_REGISTERS,
+        OperationType.STORE_BINARY_CODED_DECIMAL,
+    ]
+)
+
+
+class Superinstruction(NamedTuple):
+    """A sequence of instructions executed by a single fused handler.
+
+    type is the type of the last instruction in the sequence. A variable
+    superinstruction's handler returns how many of its instructions were
+    executed, otherwise all of them always are.
+    """
+
+    type: OperationType
+    handler: str
+    instructions: Tuple[Instruction, ...]
+    variable: bool = False
+
+
+Code = List[Tuple[int, Union[Instruction, Superinstruction]]]
+Pass = Callable[[object, Code], Code]
+
+
+@dataclass
+class Block:
+    """A translated run of instructions.
+
+    start and end are the addresses of the first instruction and the byte
+    after the last instruction. Calling run executes the whole block against
+    a CPU and returns the number of instructions executed.
+    """
+
+    start: int
+    end: int
+    run: Callable[["CPU", "Block"], int]
+    # Set when memory inside the block is written to.
+    stale: bool = False
+
+    @property
+    def addresses(self) -> range:
+        return range(self.start, self.end)
+
+
+def scan(memory, address: int, table=None) -> Code:
+    """Read the straight-line run of instructions starting at address.
+
+    The run includes its terminating instruction. Scanning also stops before
+    an opcode that can't be decoded, or at the end of memory, so the CPU can
+    report the error when it reaches it. FX0A always starts a block of its
+    own so run_until can stop before it while no key is pressed.
+    """
+    if table is None:
+        table = decode_table()
+
+    code: Code = []
+    while True:
+        try:
+            instruction = table[memory[address] << 8 | memory[address + 1]]
+        except InvalidMemoryAddressError:
+            break
+
+        if instruction is None:
+            break
+
+        if code and instruction.type == OperationType.WAIT_FOR_KEY_PRESS:
+            break
+
+        code.append((address, instruction))
+        if instruction.type in BLOCK_TERMINATORS:
+            break
+
+        address += 2
+
+    return code
+
+
+def emit(name: str, code: Code) -> str:
+    """Generate the source of a function executing code as a single block.
+
+    The function takes the CPU and its Block, expects the decode table in its
+    globals as D, and returns the number of instructions it executed.
+
+    After any memory write the block checks whether it has been invalidated
+    and, if so, exits so the remaining code is re-read.
+
+    Generated code is cached on disk by the recompiler, bump its VERSION when
+    changing the output.
+    """
+    lines = [f"def {name}(cpu, block):"]
+    count = 0
+
+    for address, instruction in code:
+        if isinstance(instruction, Superinstruction):
+            handler = instruction.handler
+            instructions = instruction.instructions
+        else:
+            handler = f"execute_{instruction.type.name.lower()}"
+            instructions = (instruction,)
+        arguments = ", ".join(f"D[{i.opcode:#06x}]" for i in instructions)
+        following = address + 2 * len(instructions)
+
+        if instruction.type in BLOCK_TERMINATORS:
+            lines.append(f"    cpu.program_counter = {following:#05x}")
+
+        if getattr(instruction, "variable", False):
+            # Only a block's terminating instruction may be variable
+            lines.append(f"    return {count} + cpu.{handler}({arguments})")
+            return "\n".join(lines) + "\n"
+
+        lines.append(f"    cpu.{handler}({arguments})")
+        count += len(instructions)
+
+        if instruction.type in MEMORY_WRITES:
+            lines.append("    if block.stale:")
+            lines.append(f"        cpu.program_counter = {following:#05x}")
+            lines.append(f"        return {count}")
+
+    if instruction.type not in BLOCK_TERMINATORS:
+        lines.append(f"    cpu.program_counter = {following:#05x}")
+    lines.append(f"    return {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def end_of(code: Code) -> int:
+    """Address of the byte following the last instruction in code."""
+    address, instruction = code[-1]
+    if isinstance(instruction, Superinstruction):
+        return address + 2 * len(instruction.instructions)
+    return address + 2
+
+
+def translate(memory, address: int, passes: Tuple[Pass, ...] = ()) -> Optional[Block]:
+    """Translate the instructions at address into a Block.
+
+    Each pass may rewrite the scanned code before it's emitted. Returns None
+    if there's no instruction that can be decoded at address.
+    """
+    code = scan(memory, address)
+    if not code:
+        return None
+
+    for rewrite in passes:
+        code = rewrite(memory, code)
+
+    name = f"block_{address:03x}"
+    namespace = {"D": decode_table()}
+    exec(compile(emit(name, code), f"<{name}>", "exec"), namespace)
+
+    return Block(start=address, end=end_of(code), run=namespace[name])
+
+
+class BlockCPU(CPU):
+    """A CPU which executes translated blocks of instructions.
+
+    Blocks are translated the first time their start address is reached and
+    cached. Memory writes from LOAD_REGISTERS and STORE_BINARY_CODED_DECIMAL
+    invalidate any cached block they overlap.
+
+    Each call to cycle executes a whole block and returns the number of
+    instructions it executed.
+    """
+
+    # Rewrites applied to a block's code before it's emitted.
+    passes: Tuple[Pass, ...] = ()
+
+    def __init__(self, memory, display, registers):
+        super().__init__(memory, display, registers)
+        self.blocks: Dict[int, Block] = {}
+        # Start addresses of the cached blocks covering each address.
+        self.owners: Dict[int, Set[int]] = {}
+
+    def translate(self, address: int) -> Optional[Block]:
+        """Translate and cache the block at address."""
+        block = translate(self.memory, address, self.passes)
+        if block is not None:
+            self.cache(block)
+
+        return block
+
+    def cache(self, block: Block):
+        """Add block to the cache, tracking the addresses it covers."""
+        self.blocks[block.start] = block
+        for location in block.addresses:
+            self.owners.setdefault(location, set()).add(block.start)
+
+    def invalidate(self, start: int, end: int):
+        """Drop any cached block overlapping memory from start to end."""
+        for location in range(start, end):
+            for address in self.owners.pop(location, ()):
+                block = self.blocks.pop(address, None)
+                if block is None:
+                    continue
+
+                block.stale = True
+                for owned in block.addresses:
+                    self.owners.get(owned, set()).discard(address)
+
+    def execute_store_binary_coded_decimal(self, operation: Instruction):
+        super().execute_store_binary_coded_decimal(operation)
+        self.invalidate(self.index, self.index + 3)
+
+    def execute_load_registers(self, operation: Instruction):
+        super().execute_load_registers(operation)
+        self.invalidate(self.index, self.index + operation.x + 1)
+
+    def cycle(self) -> int:
+        """Execute the block at the program counter.
+
+        Falls back to a single interpreted cycle if no block can be
+        translated, letting CPU raise for unhandled operations.
+        """
+        block = self.blocks.get(self.program_counter)
+        if block is None:
+            block = self.translate(self.program_counter)
+            if block is None:
+                super().cycle()
+                return 1
+
+        return block.run(self, block)
+
+    def run_until(self, predicate, max_cycles: int) -> int:
+        """Run whole blocks until predicate returns True or max_cycles have run.
+
+        predicate is only checked between blocks. When fewer cycles remain
+        than the next block holds, the rest are interpreted so no more than
+        max_cycles run. Breakpoints can fall inside a block, so while any are
+        set this falls back to the interpreter.
+        """
+        if self.breakpoints:
+            return super().run_until(predicate, max_cycles)
+
+        memory = self.memory.memory
+        blocks = self.blocks
+        count = 0
+
+        self.error = None
+        self.stop_reason = StopReason.CYCLES
+        while count < max_cycles:
+            if predicate is not None and predicate(self):
+                self.stop_reason = StopReason.PREDICATE
+                break
+
+            address = self.program_counter
+            block = blocks.get(address)
+            if block is None:
+                block = self.translate(address)
+                if block is None:
+                    # Let the interpreter find the error, or run the
+                    # instruction if the recompiled code didn't cover it.
+                    executed = super().run_until(None, 1)
+                    if not executed:
+                        break
+                    count += executed
+                    continue
+
+            kind = memory[address] >> 4
+            if kind == 0xF and self.keycode is None and memory[address + 1] == 0x0A:
+                self.stop_reason = StopReason.KEY_WAIT
+                break
+
+            # Spinning jumps are caught as their loop comes back round to
+            # them, at the start of a block.
+            if kind == 0x1:
+                idle = self.idle_at(address)
+                if idle is not None:
+                    self.stop_reason = idle
+                    break
+
+            remaining = max_cycles - count
+            if block.end - address > 2 * remaining:
+                count += super().run_until(predicate, remaining)
+                break
+
+            count += block.run(self, block)
+
+        return count
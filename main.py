@@ -1,31 +1,124 @@
 import argparse
+import math
 
-from chip8.interpreter import Interpreter
+from chip8.interpreter import FRAME_RATE, Interpreter
 from chip8.memory import Memory
-from chip8.backends.pygame import PyGameBackend, Display as PyGameDisplay
-from chip8.backends.pysdl import PySDLBackend, Display as SDLDisplay
+from chip8.backends.headless import HeadlessBackend, Display as HeadlessDisplay
 from chip8.cpu import CPU, Registers
-from chip8.profiler import CPUProfiler
+from chip8.profiler import (
+    PROFILERS,
+    AddressProfiler,
+    CPUProfiler,
+    OperationProfiler,
+    SamplingProfiler,
+)
+from chip8.translator import BlockCPU
+from chip8.recompiler import CompiledCPU, load_file
+from chip8.fusion import FusedCPU
 
+ENGINES = {
+    "interpreter": CPU,
+    "blocks": BlockCPU,
+    "compiled": CompiledCPU,
+    "fused": FusedCPU,
+}
 
-def main(rom_path, backend_name, scale, hertz, profile):
+
+def main(
+    rom_path,
+    backend_name,
+    scale,
+    hertz,
+    profile,
+    engine,
+    cycles,
+    profilers=None,
+    profile_json=None,
+    profile_stacks=None,
+    metrics_port=None,
+    metrics_socket=None,
+    trace=None,
+    sample_rate=1000,
+):
     memory = Memory()
+    instructions_per_frame = max(1, round(hertz / FRAME_RATE))
+    frame_profilers = []
+
+    if backend_name == "headless":
+        display = HeadlessDisplay()
+        backend = HeadlessBackend(frames=math.ceil(cycles / instructions_per_frame))
+    # Windowed backends are imported on demand so headless runs don't need them
+    elif backend_name == "pygame":
+        from chip8.backends.pygame import Hud, PyGameBackend, Display as PyGameDisplay
 
-    if backend_name == "pygame":
         display = PyGameDisplay(scale=scale)
-        backend = PyGameBackend(hertz=hertz)
+        backend = PyGameBackend(hertz=FRAME_RATE)
+        frame_profilers.append(Hud(display))
     else:
+        from chip8.backends.pysdl import PySDLBackend, Display as SDLDisplay
+
         display = SDLDisplay(scale=scale)
-        backend = PySDLBackend(hertz=hertz)
+        backend = PySDLBackend(hertz=FRAME_RATE)
+
+    if trace:
+        from chip8.tracing import TraceProfiler, TracedDisplay
 
-    cpu = CPU(memory, display, Registers())
-    if profile:
-        cpu = CPUProfiler(cpu)
+        tracer = TraceProfiler(trace)
+        frame_profilers.append(tracer)
+        cpu = ENGINES[engine](memory, TracedDisplay(display, tracer), Registers())
+    else:
+        cpu = ENGINES[engine](memory, display, Registers())
+    if engine == "compiled":
+        cpu.install(load_file(rom_path))
+    if profile_stacks:
+        profilers = list(profilers or []) + ["addresses"]
+    if profile or profilers or profile_json:
+        if profilers:
+            profilers = [
+                (
+                    SamplingProfiler(sample_rate)
+                    if name == "sampling"
+                    else PROFILERS[name]()
+                )
+                for name in dict.fromkeys(profilers)
+            ]
+        cpu = CPUProfiler(cpu, profilers, profile_json)
+
+    server = None
+    if metrics_port is not None or metrics_socket is not None:
+        from chip8.metrics import MetricsProfiler, serve
 
-    interpreter = Interpreter(backend, cpu)
+        metrics = MetricsProfiler(FRAME_RATE)
+        operations = next(
+            (
+                profiler
+                for profiler in getattr(cpu, "profilers", [])
+                if isinstance(profiler, OperationProfiler)
+            ),
+            None,
+        )
+        server = serve(metrics, operations, metrics_port, metrics_socket)
+        frame_profilers.append(metrics)
+
+    interpreter = Interpreter(backend, cpu, instructions_per_frame, frame_profilers)
     interpreter.boot()
     interpreter.load_rom(rom_path)
     interpreter.run()
+    if interpreter.idle_instructions:
+        print(interpreter.idle_report())
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    if profile_stacks:
+        with open(profile_stacks, "w") as f:
+            for profiler in cpu.profilers:
+                if isinstance(profiler, AddressProfiler):
+                    f.write(profiler.collapsed() + "\n")
+
+    if backend_name == "headless":
+        print(display)
 
 
 if __name__ == "__main__":
@@ -34,7 +127,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--backend",
         help="Backend used to run the interpreter",
-        choices=["pygame", "sdl"],
+        choices=["pygame", "sdl", "headless"],
         default="pygame",
     )
     parser.add_argument(
@@ -57,6 +150,70 @@ if __name__ == "__main__":
         action=argparse.BooleanOptionalAction,
         help="Profile CPU cycles. Outputs results on exit",
     )
+    parser.add_argument(
+        "--profiler",
+        help="Profiler to run, may be given more than once. Implies --profile. 'operations' times each type of operation, interpreting every instruction. 'display' counts and times the display's sprite draws, clears and updates",
+        choices=PROFILERS.keys(),
+        action="append",
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        help="Samples per second taken by --profiler sampling",
+        default=1000,
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=str,
+        help="Write profiler results as JSON to path on exit. Implies --profile",
+    )
+    parser.add_argument(
+        "--profile-stacks",
+        type=str,
+        help="Write the guest call stacks to path on exit, collapsed for flamegraph tools. Implies --profiler addresses",
+    )
+    parser.add_argument(
+        "--engine",
+        help="CPU engine. 'blocks' translates and caches runs of instructions, executing a run per cycle. 'compiled' does the same ahead of time, caching the result on disk. 'fused' adds superinstructions for common sequences to 'blocks'",
+        choices=ENGINES.keys(),
+        default="interpreter",
+    )
+    parser.add_argument(
+        "--cycles",
+        type=int,
+        help="Number of instructions the headless backend runs before printing the display and exiting, rounded up to whole frames",
+        default=10_000,
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live metrics in OpenMetrics format on this localhost port, at /metrics. Per operation counts need --profiler operations",
+    )
+    parser.add_argument(
+        "--metrics-socket",
+        type=str,
+        help="Serve live metrics in OpenMetrics format on this Unix socket path instead of a port",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Stream a timeline of each frame's phases and sprite draws to path, as Chrome trace events",
+    )
     args = parser.parse_args()
 
-    main(args.path, args.backend, args.scale, args.hertz, args.profile)
+    main(
+        args.path,
+        args.backend,
+        args.scale,
+        args.hertz,
+        args.profile,
+        args.engine,
+        args.cycles,
+        args.profiler,
+        args.profile_json,
+        args.profile_stacks,
+        args.metrics_port,
+        args.metrics_socket,
+        args.trace,
+        args.sample_rate,
+    )
@@ -0,0 +1,61 @@
+from chip8.backends.base import Framebuffer
+
+
+def test_draw_sprite():
+    framebuffer = Framebuffer()
+
+    assert not framebuffer.draw_sprite([0b10100000, 0b01000000], 8, 2)
+    assert sorted(framebuffer.lit()) == [(8, 2), (9, 3), (10, 2)]
+
+
+def test_draw_sprite_collision():
+    framebuffer = Framebuffer()
+    framebuffer.draw_sprite([0b00000001], 0, 0)
+
+    assert not framebuffer.draw_sprite([0b00000010], 0, 0)
+    assert framebuffer.draw_sprite([0b00000001], 0, 0)
+    assert list(framebuffer.lit()) == [(6, 0)]
+
+
+def test_draw_sprite_wraps_horizontally():
+    framebuffer = Framebuffer()
+
+    framebuffer.draw_sprite([0b11110000], 62, 0)
+
+    assert sorted(framebuffer.lit()) == [(0, 0), (1, 0), (62, 0), (63, 0)]
+
+
+def test_draw_sprite_coordinates_wrap():
+    framebuffer = Framebuffer()
+
+    framebuffer.draw_sprite([0b10000000], 64 + 5, 32 + 3)
+
+    assert framebuffer.pixel(5, 3)
+
+
+def test_clear():
+    framebuffer = Framebuffer()
+    framebuffer.draw_sprite([0xFF], 0, 0)
+
+    framebuffer.clear()
+
+    assert list(framebuffer.lit()) == []
+
+
+def test_dirty_rows():
+    framebuffer = Framebuffer()
+
+    framebuffer.draw_sprite([0xFF, 0xFF], 0, 31)
+
+    assert framebuffer.take_dirty() == [0, 31]
+    assert framebuffer.take_dirty() == []
+
+
+def test_clear_marks_lit_rows_dirty():
+    framebuffer = Framebuffer()
+    framebuffer.draw_sprite([0xFF], 0, 3)
+    framebuffer.take_dirty()
+
+    framebuffer.clear()
+
+    assert framebuffer.take_dirty() == [3]
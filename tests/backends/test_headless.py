@@ -0,0 +1,95 @@
+from chip8.backends.events import Event, EventType
+from chip8.backends.headless import Display, HeadlessBackend
+
+
+def frames(backend):
+    """Run the backend as the interpreter would, collecting events per frame."""
+    collected = []
+    while True:
+        backend.throttle()
+        events = list(backend.get())
+        collected.append(events)
+        if any(event.type == EventType.QUIT for event in events):
+            return collected
+
+
+def test_scripted_events():
+    keydown = Event(type=EventType.KEYDOWN, keycode=49)
+    backend = HeadlessBackend(events={1: [keydown]}, frames=3)
+
+    assert frames(backend) == [[], [keydown], [], [Event(type=EventType.QUIT)]]
+
+
+def test_skip_stops_before_events():
+    backend = HeadlessBackend(events={5: [Event(type=EventType.KEYDOWN)]}, frames=10)
+    backend.throttle()
+
+    assert backend.skip(2) == 2
+    assert backend.skip() == 2
+    backend.throttle()
+    assert backend.frame == 5
+    assert backend.skip() == 4
+    backend.throttle()
+    assert backend.frame == 10
+
+
+def test_skip_without_end():
+    backend = HeadlessBackend()
+    backend.throttle()
+
+    assert backend.skip() == 0
+    assert backend.skip(3) == 3
+
+
+def test_draw_sprite():
+    display = Display()
+
+    assert not display.draw_sprite([0b10000001], 0, 0)
+    assert display.pixel(0, 0)
+    assert display.pixel(7, 0)
+    assert not display.pixel(1, 0)
+
+
+def test_draw_sprite_xor_collision():
+    display = Display()
+    display.draw_sprite([0b11000000], 0, 0)
+
+    assert display.draw_sprite([0b10000000], 0, 0)
+    assert not display.pixel(0, 0)
+    assert display.pixel(1, 0)
+
+
+def test_draw_sprite_wraps():
+    display = Display()
+
+    display.draw_sprite([0b11000000, 0b11000000], 63, 31)
+
+    assert sorted(display.lit()) == [(0, 0), (0, 31), (63, 0), (63, 31)]
+
+
+def test_update():
+    display = Display()
+
+    display.update()
+
+    assert display.frames == 1
+
+
+def test_clear():
+    display = Display()
+    display.draw_sprite([0xFF], 0, 0)
+
+    display.clear()
+
+    assert not any(display.rows)
+
+
+def test_str():
+    display = Display()
+    display.draw_sprite([0b10100000], 0, 1)
+
+    lines = str(display).splitlines()
+
+    assert len(lines) == 32
+    assert lines[0] == "." * 64
+    assert lines[1] == "#.#" + "." * 61
@@ -1,8 +1,9 @@
 import time
 
+import pygame
 import pytest
 
-from chip8.backends.pygame import PyGameBackend
+from chip8.backends.pygame import Color, Display, Hud, PyGameBackend, runs
 
 
 def test_throttle():
@@ -17,3 +18,77 @@ def test_throttle():
         backend.throttle()
 
     assert 1 == pytest.approx(time.time() - start, 0.1)
+
+
+def test_runs():
+    assert list(runs([0, 1, 2, 5, 7, 8])) == [(0, 3), (5, 6), (7, 9)]
+
+
+def test_update(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    updated = []
+    monkeypatch.setattr(pygame.display, "update", updated.append)
+    display = Display(scale=2)
+
+    display.draw_sprite([0b11000000], 63, 4)
+    display.draw_sprite([0b10000000], 0, 5)
+    display.update()
+
+    assert display.surface.get_at((63, 4)) == Color.ON.value
+    assert display.surface.get_at((0, 4)) == Color.ON.value
+    assert display.surface.get_at((1, 4)) == Color.OFF.value
+    assert display.display.get_at((127, 9)) == Color.ON.value
+    assert updated == [[pygame.Rect(0, 8, 128, 4)]]
+
+    display.update()
+
+    assert len(updated) == 1
+
+
+def test_hud(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    updated = []
+    monkeypatch.setattr(pygame.display, "update", updated.append)
+    display = Display(scale=4)
+    hud = Hud(display, interval=0.25)
+
+    hud.toggle()
+
+    assert display.display.get_size() == (256, 128 + hud.height)
+    assert display.dirty == set(range(32))
+
+    hud.span("throttle", 0, 750_000_000)
+    hud.span("update", 0, 1_000_000)
+    hud.frame(hud.started, hud.started + 1_000_000, 100)
+    assert updated == []
+
+    hud.frame(hud.started, hud.started + 1_000_000_000, 400)
+    assert updated == [pygame.Rect(0, 128, 256, hud.height)]
+    assert hud.frames == 0
+    assert "idle 75%" in hud.texts
+    assert "0.00 MIPS" in hud.texts
+    assert "2 fps" in hud.texts
+
+    hud.toggle()
+
+    assert display.display.get_size() == (256, 128)
+
+
+def test_hud_fields():
+    hud = Hud.__new__(Hud)
+    hud.reset(0)
+    hud.instructions = 500_000
+    hud.frames = 60
+    hud.busy = 60_000_000
+    hud.rendering = 6_000_000
+    hud.idle = 900_000_000
+
+    assert hud.fields(1_000_000_000) == [
+        "0.50 MIPS",
+        "60 fps",
+        "frame 1.00ms",
+        "render 0.10ms",
+        "idle 90%",
+    ]
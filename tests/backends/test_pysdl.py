@@ -1,8 +1,10 @@
 import time
 
 import pytest
+import sdl2
+import sdl2.ext
 
-from chip8.backends.pysdl import PySDLBackend
+from chip8.backends.pysdl import Display, PySDLBackend
 
 
 def test_throttle():
@@ -17,3 +19,40 @@ def test_throttle():
         backend.throttle()
 
     assert 1 == pytest.approx(time.time() - start, 0.1)
+
+
+def test_update(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    sdl2.ext.init()
+    display = Display(scale=2)
+    on, off = display.colors[0x80][:4], display.colors[0][:4]
+
+    display.draw_sprite([0b11000000], 63, 4)
+    display.update()
+
+    def pixel(x, y):
+        start = y * display.pitch + x * 4
+        return bytes(display.pixels[start : start + 4])
+
+    assert pixel(63, 4) == on
+    assert pixel(0, 4) == on
+    assert pixel(1, 4) == off
+    assert pixel(63, 5) == off
+    assert display.take_dirty() == []
+
+
+def test_update_presents_without_dirty_rows(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    sdl2.ext.init()
+    display = Display(scale=2)
+    streamed = []
+    presented = []
+    monkeypatch.setattr(display, "stream", streamed.append)
+    monkeypatch.setattr(display.renderer, "present", lambda: presented.append(1))
+
+    display.draw_sprite([0b10000000], 0, 0)
+    display.update()
+    display.update()
+
+    assert streamed == [[0]]
+    assert len(presented) == 2
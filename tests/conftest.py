@@ -1,5 +1,3 @@
-from ctypes import c_uint8
-
 import pytest
 
 from chip8.cpu import (
@@ -33,7 +31,7 @@ def registers(request):
     registers = Registers()
     try:
         for key, value in request.param:
-            registers[key] = c_uint8(value)
+            registers[key] = value
     except TypeError:
         raise pytest.UsageError("Make sure fixture data for registers is iterable.")
     except AttributeError:
@@ -65,6 +63,11 @@ def display():
 
         clear_called = False
 
+        def update(self, *args, **kwargs):
+            self.updates += 1
+
+        updates = 0
+
     return Display(width=64, height=45, scale=4)
 
 
@@ -0,0 +1,44 @@
+import pytest
+
+from bench import bench, run_trial, summarise
+
+# V0 += 1, jump back to it
+ROM = bytes([0x70, 0x01, 0x12, 0x00])
+
+
+@pytest.fixture
+def rom_path(tmp_path):
+    path = tmp_path / "rom.ch8"
+    path.write_bytes(ROM)
+    return path
+
+
+def test_run_trial(rom_path):
+    result = run_trial(rom_path, "interpreter", hertz=600, cycles=95)
+
+    # Rounded up to whole frames of 10 instructions
+    assert result["frames"] == 10
+    assert result["instructions"] == 100
+
+
+def test_run_trial_key_wait_finishes(tmp_path):
+    path = tmp_path / "rom.ch8"
+    path.write_bytes(bytes([0xF0, 0x0A]))
+
+    result = run_trial(path, "interpreter", hertz=600, cycles=100)
+
+    assert result["frames"] == 10
+    assert result["instructions"] == 0
+
+
+def test_bench(rom_path):
+    result = bench(rom_path, "blocks", 600, 100, None, trials=3)
+
+    assert len(result["trials"]) == 3
+    assert result["ips"]["min"] <= result["ips"]["median"] <= result["ips"]["max"]
+    assert result["peak_memory"] > 0
+
+
+def test_summarise():
+    assert summarise([1, 2, 6]) == {"median": 2, "variance": 7, "min": 1, "max": 6}
+    assert summarise([4])["variance"] == 0
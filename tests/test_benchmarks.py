@@ -0,0 +1,39 @@
+from benchmarks.opcodes import CASES, compare, measure
+
+
+def results(samples):
+    return {"alu": {"samples": samples}}
+
+
+def test_compare_flags_significant_slowdown():
+    baseline = results([100, 101, 99, 100, 102])
+
+    (comparison,) = compare(baseline, results([120, 121, 119, 122, 120]))
+
+    assert comparison.slower
+    assert round(comparison.change, 2) == 0.2
+
+
+def test_compare_ignores_noise():
+    baseline = results([100, 140, 80, 120, 90])
+
+    (comparison,) = compare(baseline, results([110, 90, 150, 95, 105]))
+
+    assert not comparison.slower
+
+
+def test_compare_ignores_speedup():
+    baseline = results([100, 101, 99, 100, 102])
+
+    (comparison,) = compare(baseline, results([80, 81, 79, 80, 82]))
+
+    assert not comparison.slower
+
+
+def test_compare_skips_missing_families():
+    assert compare({}, results([1, 2, 3])) == []
+
+
+def test_cases_run():
+    for case in CASES:
+        assert len(measure(case, number=1, repeat=2)) == 2
@@ -1,4 +1,3 @@
-from ctypes import c_uint8
 import pytest
 
 from chip8.cpu import (
@@ -7,11 +6,14 @@ from chip8.cpu import (
     Operation,
     OperationType,
     CPU,
+    StopReason,
     UnhandledOperationError,
     FONT_ADDRESS_START,
+    decode_table,
+    rules,
 )
 from chip8.fonts import Font
-from chip8.memory import Memory
+from chip8.memory import Memory, InvalidMemoryAddressError
 
 
 class TestRegisters:
@@ -27,6 +29,21 @@ class TestRegisters:
         with pytest.raises(InvalidRegisterError):
             registers["invalid"]
 
+    def test_set_out_of_range_register(self, registers):
+        with pytest.raises(InvalidRegisterError):
+            registers[0x10] = 0b00001111
+
+    def test_access_negative_register(self, registers):
+        with pytest.raises(InvalidRegisterError):
+            registers[-1]
+
+    def test_wraparound(self, registers):
+        registers[0x0] = 0x101
+        registers.V1 = -1
+
+        assert registers[0x0] == 0x1
+        assert registers[0x1] == 0xFF
+
     def test_direct_access_get(self, registers):
         registers[0x0] = 0b00001111
         assert registers.V0 == 0b00001111
@@ -277,6 +294,179 @@ class TestOperation:
         assert operation.type == OperationType.STORE_REGISTERS
 
 
+class TestDecodeTable:
+    def test_size(self):
+        assert len(decode_table()) == 0x10000
+
+    def test_built_once(self):
+        assert decode_table() is decode_table()
+
+    def test_operands(self):
+        instruction = decode_table()[0xD12F]
+
+        assert instruction.type == OperationType.DISPLAY
+        assert instruction.x == 0x1
+        assert instruction.y == 0x2
+        assert instruction.n == 0xF
+        assert instruction.nn == 0x2F
+        assert instruction.nnn == 0x12F
+
+    def test_matches_rules(self):
+        for opcode in range(0x0, 0x10000, 0x7):
+            instruction = decode_table()[opcode]
+            operation = Operation.decode(opcode)
+            rule = next((r for r in rules if r.match(operation)), None)
+
+            if rule is None:
+                assert instruction is None
+            else:
+                assert instruction.type == rule.type
+
+    def test_unhandled(self, cpu):
+        with pytest.raises(UnhandledOperationError) as e:
+            cpu.decode(0xF01F)
+        assert e.value.operation.opcode == 0xF01F
+
+
+class TestCPUDispatch:
+    def test_every_operation_type_has_handler(self, cpu):
+        assert set(cpu.handlers) == set(OperationType)
+
+
+class TestCPURun:
+    # V0 += 1, jump back to it
+    LOOP = [0x70, 0x01, 0x12, 0x00]
+
+    @pytest.mark.parametrize("memory", [LOOP], indirect=True)
+    def test_run_cycles(self, cpu):
+        assert cpu.run_cycles(10) == 10
+        assert cpu.stop_reason == StopReason.CYCLES
+        assert cpu.registers[0x0] == 5
+        assert cpu.program_counter == 0x200
+
+    @pytest.mark.parametrize("memory", [LOOP], indirect=True)
+    def test_conforms_to_cycle(self, memory, display, cpu):
+        cpu.delay_timer = 3
+        reference = CPU(Memory(), display, Registers())
+        reference.memory[0x200:0x204] = self.LOOP
+        reference.delay_timer = 3
+
+        cpu.run_cycles(7)
+        for _ in range(7):
+            reference.cycle()
+
+        assert list(cpu.v) == list(reference.v)
+        assert cpu.program_counter == reference.program_counter
+        assert cpu.delay_timer == reference.delay_timer == 3
+
+    @pytest.mark.parametrize("memory", [LOOP], indirect=True)
+    def test_run_until(self, cpu):
+        executed = cpu.run_until(lambda cpu: cpu.registers[0x0] == 3, 100)
+
+        assert executed == 5
+        assert cpu.stop_reason == StopReason.PREDICATE
+
+    @pytest.mark.parametrize("memory", [LOOP], indirect=True)
+    def test_stops_at_breakpoint(self, cpu):
+        cpu.breakpoints.add(0x202)
+
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.BREAKPOINT
+        assert cpu.program_counter == 0x202
+
+    @pytest.mark.parametrize("memory", [LOOP], indirect=True)
+    def test_resumes_from_breakpoint(self, cpu):
+        cpu.breakpoints.add(0x202)
+        cpu.run_cycles(10)
+
+        assert cpu.run_cycles(10) == 2
+        assert cpu.registers[0x0] == 2
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0xF0, 0x0A]], indirect=True)
+    def test_stops_at_key_wait(self, cpu):
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.KEY_WAIT
+        assert cpu.program_counter == 0x202
+
+    # Wait for a key in V1, jump to the next instruction, V0 += 1
+    @pytest.mark.parametrize(
+        "memory", [[0xF1, 0x0A, 0x12, 0x04, 0x70, 0x01]], indirect=True
+    )
+    def test_runs_instruction_after_key_wait(self, cpu):
+        assert cpu.run_cycles(3) == 0
+        assert cpu.stop_reason == StopReason.KEY_WAIT
+
+        cpu.keycode = 0x5
+        assert cpu.run_cycles(3) == 3
+        assert cpu.registers[0x1] == 0x5
+        assert cpu.registers[0x0] == 1
+        assert cpu.program_counter == 0x206
+
+    @pytest.mark.parametrize("registers", [[(0x1, 0x7)]], indirect=True)
+    @pytest.mark.parametrize("memory", [[0xF1, 0x0A]], indirect=True)
+    def test_key_wait_accepts_key_zero(self, cpu):
+        cpu.keycode = 0x0
+
+        assert cpu.run_cycles(1) == 1
+        assert cpu.stop_reason == StopReason.CYCLES
+        assert cpu.registers[0x1] == 0x0
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0xF0, 0x1F]], indirect=True)
+    def test_stops_at_unhandled_operation(self, cpu):
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.UNHANDLED_OPERATION
+        assert isinstance(cpu.error, UnhandledOperationError)
+        assert cpu.program_counter == 0x202
+
+    # V0 += 1, jump to self
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x02]], indirect=True)
+    def test_stops_at_jump_to_self(self, cpu):
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.JUMP_TO_SELF
+        assert cpu.program_counter == 0x202
+
+        assert cpu.run_cycles(10) == 0
+
+    # V1 = DT, skip if V1 == 0, jump back to V1 = DT
+    DELAY_WAIT = [0xF1, 0x07, 0x31, 0x00, 0x12, 0x00]
+
+    @pytest.mark.parametrize("memory", [DELAY_WAIT], indirect=True)
+    def test_stops_at_delay_wait(self, cpu):
+        cpu.delay_timer = 2
+
+        assert cpu.run_cycles(10) == 2
+        assert cpu.stop_reason == StopReason.DELAY_WAIT
+        assert cpu.program_counter == 0x204
+
+        cpu.tick_timers(2)
+        assert cpu.run_cycles(3) == 3
+        assert cpu.program_counter == 0x206
+
+    @pytest.mark.parametrize(
+        "memory", [[0xF1, 0x07, 0x31, 0x01, 0x12, 0x00]], indirect=True
+    )
+    def test_other_polling_loops_run(self, cpu):
+        cpu.delay_timer = 2
+
+        assert cpu.run_cycles(10) == 10
+        assert cpu.stop_reason == StopReason.CYCLES
+
+    def test_tick_timers(self, cpu):
+        cpu.delay_timer = 3
+        cpu.sound_timer = 1
+
+        cpu.tick_timers(2)
+
+        assert cpu.delay_timer == 1
+        assert cpu.sound_timer == 0
+
+    def test_out_of_memory(self, cpu):
+        cpu.program_counter = 0xFFF
+
+        with pytest.raises(InvalidMemoryAddressError):
+            cpu.run_cycles(1)
+
+
 class TestCPUExecute:
     @pytest.mark.parametrize("memory", [[0xF0, 0x1F]], indirect=True)
     def test_raises_unhandled_operation(self, cpu):
@@ -367,13 +557,13 @@ class TestCPUExecute:
     def test_set_register(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x0].value == c_uint8(0xC).value
+        assert cpu.registers[0x0] == 0xC
 
     @pytest.mark.parametrize("memory", [[0x70, 0x09]], indirect=True)
     def test_add(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x0].value == c_uint8(0x9).value
+        assert cpu.registers[0x0] == 0x9
 
     @pytest.mark.parametrize("memory", [[0x85, 0x60]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x0)]], indirect=True)
@@ -387,101 +577,101 @@ class TestCPUExecute:
     def test_set_vx_to_vx_or_vy(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x1).value
+        assert cpu.registers[0x5] == 0x1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x62]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x0)]], indirect=True)
     def test_set_vx_to_vx_and_vy(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x0).value
+        assert cpu.registers[0x5] == 0x0
 
     @pytest.mark.parametrize("memory", [[0x85, 0x63]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x0)]], indirect=True)
     def test_set_vx_to_vx_xor_vy(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x1).value
+        assert cpu.registers[0x5] == 0x1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x64]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0xFF), (0x6, 0x1)]], indirect=True)
     def test_set_vx_to_vx_add_vy_true(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x0).value
-        assert cpu.registers[0xF].value == c_uint8(1).value
+        assert cpu.registers[0x5] == 0x0
+        assert cpu.registers[0xF] == 1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x64]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x0), (0x6, 0x1)]], indirect=True)
     def test_set_vx_to_vx_add_vy_false(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x1).value
-        assert cpu.registers[0xF].value == c_uint8(0).value
+        assert cpu.registers[0x5] == 0x1
+        assert cpu.registers[0xF] == 0
 
     @pytest.mark.parametrize("memory", [[0x85, 0x65]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0xFF), (0x6, 0x1)]], indirect=True)
     def test_set_vx_to_vx_sub_vy_true(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0xFE).value
-        assert cpu.registers[0xF].value == c_uint8(1).value
+        assert cpu.registers[0x5] == 0xFE
+        assert cpu.registers[0xF] == 1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x65]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0xFF)]], indirect=True)
     def test_set_vx_to_vx_sub_vy_false(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x2).value
-        assert cpu.registers[0xF].value == c_uint8(0).value
+        assert cpu.registers[0x5] == 0x2
+        assert cpu.registers[0xF] == 0
 
     @pytest.mark.parametrize("memory", [[0x85, 0x66]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x3)]], indirect=True)
     def test_shift_vx_right_with_odd_number(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x1).value
-        assert cpu.registers[0xF].value == c_uint8(1).value
+        assert cpu.registers[0x5] == 0x1
+        assert cpu.registers[0xF] == 1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x66]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x2), (0x6, 0x2)]], indirect=True)
     def test_shift_vx_right_with_event_number(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x1).value
-        assert cpu.registers[0xF].value == c_uint8(0).value
+        assert cpu.registers[0x5] == 0x1
+        assert cpu.registers[0xF] == 0
 
     @pytest.mark.parametrize("memory", [[0x85, 0x67]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0xFF)]], indirect=True)
     def test_set_vx_to_vy_sub_vx_true(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0xFE).value
-        assert cpu.registers[0xF].value == c_uint8(1).value
+        assert cpu.registers[0x5] == 0xFE
+        assert cpu.registers[0xF] == 1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x67]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0xFF), (0x6, 0x1)]], indirect=True)
     def test_set_vx_to_vy_sub_vx_false(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x2).value
-        assert cpu.registers[0xF].value == c_uint8(0).value
+        assert cpu.registers[0x5] == 0x2
+        assert cpu.registers[0xF] == 0
 
     @pytest.mark.parametrize("memory", [[0x85, 0x6E]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0xFF), (0x6, 0x3)]], indirect=True)
     def test_shift_vx_left_with_most_significant_bit_set(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x6).value
-        assert cpu.registers[0xF].value == c_uint8(1).value
+        assert cpu.registers[0x5] == 0x6
+        assert cpu.registers[0xF] == 1
 
     @pytest.mark.parametrize("memory", [[0x85, 0x6E]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x2)]], indirect=True)
     def test_shift_vx_left_with_most_significant_bit_not_set(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == c_uint8(0x4).value
-        assert cpu.registers[0xF].value == c_uint8(0).value
+        assert cpu.registers[0x5] == 0x4
+        assert cpu.registers[0xF] == 0
 
     @pytest.mark.parametrize("memory", [[0x95, 0x60]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x5, 0x1), (0x6, 0x0)]], indirect=True)
@@ -514,7 +704,7 @@ class TestCPUExecute:
         cpu.cycle()
 
         assert cpu.display.draw_sprite_called is True
-        assert cpu.registers[0xF].value == 0x0
+        assert cpu.registers[0xF] == 0x0
 
     @pytest.mark.parametrize("memory", [[0xE3, 0x9E]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x3, 0x5)]], indirect=True)
@@ -555,8 +745,8 @@ class TestCPUExecute:
 
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == 0x01
-        assert cpu.program_counter == 0x204
+        assert cpu.registers[0x5] == 0x01
+        assert cpu.program_counter == 0x202
 
     @pytest.mark.parametrize("memory", [[0xF5, 0x0A]], indirect=True)
     def test_wait_for_key_press_false(self, cpu):
@@ -570,24 +760,23 @@ class TestCPUExecute:
     def test_set_delay_timer_to_vx(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x3].value == 5
-        # delay timer is decreased after being set
-        assert cpu.delay_timer.value == 4
+        assert cpu.registers[0x3] == 5
+        # timers are only decreased once per frame, by the interpreter
+        assert cpu.delay_timer == 5
 
     @pytest.mark.parametrize("registers", [[(0x3, 0x5)]], indirect=True)
     @pytest.mark.parametrize("memory", [[0xF3, 0x18]], indirect=True)
     def test_set_sound_timer_to_vx(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x3].value == 5
-        # sound timer is decreased after being set
-        assert cpu.sound_timer.value == 4
+        assert cpu.registers[0x3] == 5
+        assert cpu.sound_timer == 5
 
     @pytest.mark.parametrize("memory", [[0xF5, 0x07]], indirect=True)
     def test_set_vx_to_delay_timer(self, cpu):
         cpu.cycle()
 
-        assert cpu.registers[0x5].value == cpu.delay_timer.value
+        assert cpu.registers[0x5] == cpu.delay_timer
 
     @pytest.mark.parametrize("memory", [[0xF3, 0x1E]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x3, 0x1)]], indirect=True)
@@ -601,11 +790,22 @@ class TestCPUExecute:
     @pytest.mark.parametrize("memory", [[0xF3, 0x29]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x3, 0x1), (0x6, 0x1)]], indirect=True)
     def test_font(self, cpu):
-        cpu.memory[FONT_ADDRESS_START : FONT_ADDRESS_START + 5] = Font.ONE.value
+        cpu.load_font()
 
         cpu.cycle()
 
-        assert cpu.index == FONT_ADDRESS_START
+        assert cpu.index == FONT_ADDRESS_START + 5
+        assert cpu.memory[cpu.index : cpu.index + 5] == bytes(Font.ONE.value)
+
+    @pytest.mark.parametrize("memory", [[0xF3, 0x29]], indirect=True)
+    @pytest.mark.parametrize("registers", [[(0x3, 0xF)]], indirect=True)
+    def test_font_loaded_elsewhere(self, cpu):
+        cpu.load_font(0x0)
+
+        cpu.cycle()
+
+        assert cpu.index == 0x4B
+        assert cpu.memory[cpu.index : cpu.index + 5] == bytes(Font.F.value)
 
     @pytest.mark.parametrize("memory", [[0xF3, 0x33]], indirect=True)
     @pytest.mark.parametrize("registers", [[(0x3, 0xFD)]], indirect=True)
@@ -618,6 +818,16 @@ class TestCPUExecute:
         assert cpu.memory[0x1] == 5
         assert cpu.memory[0x2] == 3
 
+    @pytest.mark.parametrize("memory", [[0xF3, 0x33]], indirect=True)
+    @pytest.mark.parametrize("registers", [[(0x3, 0x7)]], indirect=True)
+    def test_binary_coded_decimal_pads_digits(self, cpu):
+        cpu.index = 0x0
+        cpu.memory[0x0:0x3] = [0xFF, 0xFF, 0xFF]
+
+        cpu.cycle()
+
+        assert cpu.memory[0x0:0x3] == bytes([0, 0, 7])
+
     @pytest.mark.parametrize("memory", [[0xF3, 0x55]], indirect=True)
     @pytest.mark.parametrize(
         "registers", [[(0x0, 0x9), (0x1, 0x8), (0x2, 0x7), (0x3, 0x6)]], indirect=True
@@ -634,6 +844,13 @@ class TestCPUExecute:
         assert cpu.memory[0x3] == 0x6
         assert cpu.memory[0x4] == 0x0
 
+    @pytest.mark.parametrize("memory", [[0xF3, 0x55]], indirect=True)
+    def test_load_registers_out_of_memory(self, cpu):
+        cpu.index = 0xFFE
+
+        with pytest.raises(InvalidMemoryAddressError):
+            cpu.cycle()
+
     @pytest.mark.parametrize("memory", [[0xF3, 0x65]], indirect=True)
     def test_store_registers(self, cpu):
 
@@ -645,8 +862,8 @@ class TestCPUExecute:
 
         cpu.cycle()
 
-        assert cpu.registers[0x0].value == 0x9
-        assert cpu.registers[0x1].value == 0x8
-        assert cpu.registers[0x2].value == 0x7
-        assert cpu.registers[0x3].value == 0x6
-        assert cpu.registers[0x4].value == 0x0
+        assert cpu.registers[0x0] == 0x9
+        assert cpu.registers[0x1] == 0x8
+        assert cpu.registers[0x2] == 0x7
+        assert cpu.registers[0x3] == 0x6
+        assert cpu.registers[0x4] == 0x0
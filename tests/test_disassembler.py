@@ -0,0 +1,28 @@
+import pytest
+
+from chip8.cpu import OperationType, decode_table
+from chip8.disassembler import MNEMONICS, disassemble
+
+
+@pytest.mark.parametrize(
+    "opcode, assembly",
+    [
+        (0x00E0, "CLS"),
+        (0x1228, "JP 0x228"),
+        (0x3A02, "SE VA, 0x02"),
+        (0x8124, "ADD V1, V2"),
+        (0xA2EA, "LD I, 0x2ea"),
+        (0xD01F, "DRW V0, V1, 15"),
+        (0xF165, "LD V1, [I]"),
+    ],
+)
+def test_disassemble(opcode, assembly):
+    assert disassemble(decode_table()[opcode]) == assembly
+
+
+def test_unknown():
+    assert disassemble(None) == "???"
+
+
+def test_every_operation_type():
+    assert set(MNEMONICS) == set(OperationType)
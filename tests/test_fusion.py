@@ -0,0 +1,102 @@
+import pytest
+
+from chip8.cpu import CPU, OperationType
+from chip8.fusion import FusedCPU, fuse
+from chip8.translator import scan
+from tests.test_translator import ROM, create_cpu, state
+
+# fmt: off
+SEQUENCES = [
+    0x60, 0x00,  # 0x200 V0 = 0
+    0x61, 0x08,  # 0x202 V1 = 8
+    0x62, 0x04,  # 0x204 V2 = 4
+    0xA2, 0x1E,  # 0x206 I = 0x21E
+    0xD1, 0x25,  # 0x208 Draw 5 bytes from I at V1, V2
+    0x70, 0x01,  # 0x20A V0 += 1
+    0x30, 0x10,  # 0x20C Skip if V0 == 0x10
+    0x12, 0x0A,  # 0x20E Jump to 0x20A
+    0x71, 0x02,  # 0x210 V1 += 2
+    0x41, 0x20,  # 0x212 Skip if V1 != 0x20
+    0x12, 0x00,  # 0x214 Jump to 0x200
+    0x12, 0x06,  # 0x216 Jump to 0x206
+    0x00, 0x00,  # 0x218
+    0x00, 0x00,  # 0x21A
+    0x00, 0x00,  # 0x21C
+    0xF0, 0x90, 0xF0, 0x90, 0xF0,  # 0x21E Sprite
+]
+# fmt: on
+
+
+class TestFuse:
+    def test_register_loads(self, display):
+        cpu = create_cpu(CPU, display, rom=SEQUENCES)
+
+        address, instruction = fuse(cpu.memory, scan(cpu.memory, 0x200))[0]
+
+        assert address == 0x200
+        assert instruction.handler == "execute_set_registers"
+        assert len(instruction.instructions) == 3
+
+    def test_set_index_and_display(self, display):
+        cpu = create_cpu(CPU, display, rom=SEQUENCES)
+
+        address, instruction = fuse(cpu.memory, scan(cpu.memory, 0x200))[1]
+
+        assert address == 0x206
+        assert instruction.handler == "execute_set_index_and_display"
+
+    def test_count_and_jump(self, display):
+        cpu = create_cpu(CPU, display, rom=SEQUENCES)
+
+        code = fuse(cpu.memory, scan(cpu.memory, 0x20A))
+
+        assert len(code) == 1
+        assert code[0][1].type == OperationType.JUMP
+        assert code[0][1].variable
+
+    def test_unfused(self, display):
+        cpu = create_cpu(CPU, display, rom=SEQUENCES)
+        code = scan(cpu.memory, 0x216)
+
+        assert fuse(cpu.memory, code) == code
+
+
+class TestFusedCPU:
+    @pytest.mark.parametrize("rom", [ROM, SEQUENCES])
+    @pytest.mark.parametrize("cycles", [1, 10, 100, 500, 2000])
+    def test_conforms_to_cpu(self, display, rom, cycles):
+        reference = create_cpu(CPU, display, rom=rom)
+        cpu = create_cpu(FusedCPU, display, rom=rom)
+
+        executed = 0
+        while executed < cycles:
+            executed += cpu.cycle()
+
+        for _ in range(executed):
+            reference.cycle()
+
+        assert state(cpu) == state(reference)
+
+    @pytest.mark.parametrize("rom", [ROM, SEQUENCES])
+    @pytest.mark.parametrize("cycles", [1, 10, 100, 500])
+    def test_run_cycles_keeps_to_budget(self, display, rom, cycles):
+        reference = create_cpu(CPU, display, rom=rom)
+        cpu = create_cpu(FusedCPU, display, rom=rom)
+
+        executed = cpu.run_cycles(cycles)
+        reference.run_cycles(executed)
+
+        assert executed == cycles
+        assert state(cpu) == state(reference)
+
+    def test_counts_fused_instructions(self, display):
+        cpu = create_cpu(FusedCPU, display, rom=SEQUENCES)
+
+        executed = cpu.cycle()
+
+        assert executed == 8
+        assert cpu.fused == {
+            "set_registers": 3,
+            "set_index_and_display": 2,
+            "count_and_jump": 3,
+        }
@@ -0,0 +1,66 @@
+import pytest
+
+from chip8.histogram import Histogram
+
+
+class TestHistogram:
+    def test_empty(self):
+        histogram = Histogram()
+
+        assert histogram.percentile(50) == 0
+        assert histogram.summary()["count"] == 0
+
+    def test_small_values_are_exact(self):
+        histogram = Histogram(precision=5)
+        for value in range(1, 64):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == 32
+        assert histogram.min == 1
+        assert histogram.max == 63
+
+    @pytest.mark.parametrize("value", [100, 999, 123_456, 10**9, 2**62])
+    def test_relative_error(self, value):
+        histogram = Histogram(precision=5)
+        histogram.record(value)
+        histogram.record(value * 2)
+
+        assert value <= histogram.percentile(50) <= value * (1 + 1 / 32)
+
+    def test_buckets_cover_every_value(self):
+        histogram = Histogram(precision=3)
+
+        for value in range(1, 10_000):
+            index = histogram.index(value)
+            assert histogram.highest(index - 1) < value <= histogram.highest(index)
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        summary = histogram.summary()
+
+        assert summary["p50"] == pytest.approx(500_000, rel=1 / 32)
+        assert summary["p90"] == pytest.approx(900_000, rel=1 / 32)
+        assert summary["p99"] == pytest.approx(990_000, rel=1 / 32)
+        assert summary["max"] == 1_000_000
+
+    def test_fixed_memory(self):
+        histogram = Histogram()
+        size = len(histogram.counts)
+
+        for value in range(0, 10**12, 10**8):
+            histogram.record(value)
+
+        assert len(histogram.counts) == size
+
+    def test_reset(self):
+        histogram = Histogram()
+        histogram.record(5)
+
+        histogram.reset()
+
+        assert histogram.count == 0
+        assert histogram.max is None
+        assert not any(histogram.counts)
@@ -1,6 +1,10 @@
 import pytest
 
-from chip8.interpreter import Keyboard
+from chip8.backends.events import Event, EventType
+from chip8.backends.headless import HeadlessBackend
+from chip8.cpu import UnhandledOperationError
+from chip8.interpreter import DebugBindings, Interpreter, Keyboard
+from chip8.profiler import FrameProfiler
 
 
 class TestBoot:
@@ -20,6 +24,97 @@ class TestLoadRom:
         with pytest.raises(FileNotFoundError):
             interpreter.load_rom("missing.chip8")
 
+    def test_load_rom_into_memory(self, interpreter, tmp_path):
+        path = tmp_path / "rom.ch8"
+        path.write_bytes(bytes([0x12, 0x00]))
+
+        interpreter.load_rom(path)
+
+        assert interpreter.cpu.memory[0x200:0x202] == bytes([0x12, 0x00])
+
+    def test_load_rom_truncated_to_memory(self, interpreter, tmp_path):
+        path = tmp_path / "rom.ch8"
+        path.write_bytes(bytes([0x1] * 0x1000))
+
+        interpreter.load_rom(path)
+
+        assert interpreter.cpu.memory[0xFFF] == 0x1
+
+
+class TestRun:
+    # V0 += 1, jump back to it
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_frames(self, cpu):
+        cpu.delay_timer = 10
+        interpreter = Interpreter(HeadlessBackend(frames=3), cpu, 10)
+
+        interpreter.run()
+
+        assert cpu.registers[0x0] == 15
+        assert cpu.delay_timer == 7
+        assert cpu.display.updates == 3
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0xF1, 0x0A]], indirect=True)
+    def test_key_wait_ends_frame(self, cpu):
+        interpreter = Interpreter(HeadlessBackend(frames=3), cpu, 10)
+
+        interpreter.run()
+
+        assert cpu.registers[0x0] == 1
+        assert cpu.program_counter == 0x202
+
+    @pytest.mark.parametrize("memory", [[0xF0, 0x1F]], indirect=True)
+    def test_unhandled_operation(self, cpu):
+        interpreter = Interpreter(HeadlessBackend(frames=1), cpu, 10)
+
+        with pytest.raises(UnhandledOperationError):
+            interpreter.run()
+
+    # fmt: off
+    IDLE = [
+        0x60, 0x0A,  # V0 = 10
+        0xF0, 0x15,  # DT = V0
+        0xF1, 0x07,  # V1 = DT
+        0x31, 0x00,  # Skip if V1 == 0
+        0x12, 0x04,  # Jump back to V1 = DT
+        0x72, 0x01,  # V2 += 1
+        0x12, 0x0C,  # Jump to self
+    ]
+    # fmt: on
+
+    @pytest.mark.parametrize("memory", [IDLE], indirect=True)
+    def test_idle_skips_frames(self, cpu):
+        interpreter = Interpreter(HeadlessBackend(frames=100), cpu, 10)
+
+        interpreter.run()
+
+        assert cpu.registers[0x2] == 1
+        assert cpu.delay_timer == 0
+        assert interpreter.idle_frames == 2
+        assert interpreter.skipped_frames == 9 + 89
+        assert interpreter.idle_instructions == 6 + 90 + 6 + 890
+        assert cpu.display.updates == 2
+        assert "98 skipped" in interpreter.idle_report()
+
+    @pytest.mark.parametrize("memory", [[0x12, 0x00]], indirect=True)
+    def test_hud_key_toggles_frame_profilers(self, cpu):
+        class Toggled(FrameProfiler):
+            toggles = 0
+
+            def toggle(self):
+                self.toggles += 1
+
+        profiler = Toggled()
+        events = {
+            0: [Event(keycode=DebugBindings.HUD.value, type=EventType.KEYDOWN)],
+            2: [Event(keycode=DebugBindings.HUD.value, type=EventType.KEYDOWN)],
+        }
+        interpreter = Interpreter(HeadlessBackend(events, frames=3), cpu, 1, [profiler])
+
+        interpreter.run()
+
+        assert profiler.toggles == 2
+
 class TestKeyboard:
     def test_one(self):
         assert Keyboard.value_for_keycode(49) == 0x1
@@ -20,3 +20,37 @@ class TestMemory:
     def test_get_invalid_address(self, memory):
         with pytest.raises(InvalidMemoryAddressError):
             memory[0b1000000000001]
+
+    def test_size(self):
+        assert len(Memory(size=0x10000)) == 0x10000
+
+    def test_set_larger_memory(self):
+        memory = Memory(size=0x10000)
+        memory[0xFFFF] = 0b00001111
+        assert memory[0xFFFF] == 0b00001111
+
+    def test_get_slice(self, memory):
+        memory[0x200:0x203] = [0x1, 0x2, 0x3]
+        assert memory[0x200:0x203] == bytes([0x1, 0x2, 0x3])
+
+    def test_get_slice_is_view(self, memory):
+        view = memory[0x200:0x203]
+        memory[0x200] = 0x1
+        assert view[0] == 0x1
+
+    def test_set_slice_from_bytes(self, memory):
+        memory[0x200:0x202] = bytearray([0x12, 0x00])
+        assert memory[0x200] == 0x12
+
+    def test_set_slice_wrong_length(self, memory):
+        with pytest.raises(ValueError):
+            memory[0x200:0x202] = [0x1, 0x2, 0x3]
+        assert len(memory) == 4096
+
+    def test_get_invalid_slice(self, memory):
+        with pytest.raises(InvalidMemoryAddressError):
+            memory[0xFFE:0x1001]
+
+    def test_set_invalid_slice(self, memory):
+        with pytest.raises(InvalidMemoryAddressError):
+            memory[0xFFE:0x1001] = [0x0, 0x0, 0x0]
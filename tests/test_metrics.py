@@ -0,0 +1,131 @@
+import os
+import socket
+import tempfile
+import urllib.request
+
+import pytest
+
+from chip8.backends.headless import HeadlessBackend
+from chip8.cpu import OperationType
+from chip8.interpreter import Interpreter
+from chip8.metrics import CONTENT_TYPE, MetricsProfiler, exposition, serve
+from chip8.profiler import OperationProfiler
+
+
+class TestMetricsProfiler:
+    # V0 += 1, jump back to it
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_interpreter_frames(self, cpu):
+        profiler = MetricsProfiler()
+        interpreter = Interpreter(HeadlessBackend(frames=3), cpu, 10, [profiler])
+
+        interpreter.run()
+
+        assert profiler.frames == 3
+        assert profiler.instructions == 30
+        assert profiler.frame_time.count == 3
+        for name in ("throttle", "poll", "cpu", "update"):
+            assert profiler.spans[name].count >= 3
+
+    def test_dropped_frames(self):
+        profiler = MetricsProfiler(frame_rate=100)
+
+        profiler.frame(0, 5_000_000, 8)
+        profiler.frame(0, 15_000_000, 8)
+
+        assert profiler.frames == 2
+        assert profiler.dropped == 1
+
+    def test_rate(self):
+        profiler = MetricsProfiler()
+        profiler.second = 0
+
+        profiler.frame(0, 500_000_000, 100)
+        assert profiler.rate == 0.0
+        profiler.frame(500_000_000, 2_000_000_000, 300)
+
+        assert profiler.rate == 200.0
+
+
+class TestExposition:
+    def test_render(self):
+        profiler = MetricsProfiler()
+        profiler.frame(0, 1_000_000, 8)
+        profiler.span("update", 0, 2_000)
+
+        text = exposition(profiler)
+
+        assert text.endswith("# EOF\n")
+        lines = text.splitlines()
+        assert "# TYPE chip8_instructions counter" in lines
+        assert "chip8_instructions_total 8" in lines
+        assert "chip8_frames_total 1" in lines
+        assert "chip8_dropped_frames_total 0" in lines
+        assert "# TYPE chip8_frame_seconds summary" in lines
+        assert 'chip8_frame_seconds{quantile="0.5"} 0.001' in lines
+        assert "chip8_frame_seconds_count 1" in lines
+        assert "chip8_render_seconds_sum 2e-06" in lines
+        assert "chip8_poll_seconds_count 0" in lines
+        assert not any(line.startswith("chip8_operations") for line in lines)
+
+    def test_operations(self):
+        operations = OperationProfiler()
+        operations.counts[OperationType.ADD] = 3
+
+        lines = exposition(MetricsProfiler(), operations).splitlines()
+
+        assert 'chip8_operations_total{type="ADD"} 3' in lines
+
+
+class TestServe:
+    def test_http(self):
+        profiler = MetricsProfiler()
+        profiler.frame(0, 1_000_000, 8)
+        server = serve(profiler, port=0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as r:
+                assert r.headers["Content-Type"] == CONTENT_TYPE
+                body = r.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert body == exposition(profiler)
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No Unix sockets")
+    def test_unix_socket(self):
+        profiler = MetricsProfiler()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.sock")
+            server = serve(profiler, path=path)
+            try:
+                with socket.socket(socket.AF_UNIX) as client:
+                    client.connect(path)
+                    client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+                    response = b""
+                    while chunk := client.recv(4096):
+                        response += chunk
+            finally:
+                server.shutdown()
+                server.server_close()
+
+        assert response.startswith(b"HTTP/1.0 200")
+        assert response.endswith(b"# EOF\n")
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No Unix sockets")
+    def test_unix_socket_reuses_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.sock")
+            for _ in range(2):
+                server = serve(MetricsProfiler(), path=path)
+                server.shutdown()
+                server.server_close()
+
+                assert not os.path.exists(path)
+
+            # A file left behind by a run that didn't close is replaced
+            open(path, "w").close()
+            server = serve(MetricsProfiler(), path=path)
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,344 @@
+import json
+import threading
+import time
+
+import pytest
+
+from chip8.backends.headless import Display
+from chip8.cpu import OperationType, StopReason, decode_table
+from chip8.profiler import (
+    AddressProfiler,
+    CPUFrequencyProfiler,
+    CPUProfiler,
+    DisplayProfiler,
+    OperationProfiler,
+    Profiler,
+    SamplingProfiler,
+    WindowedHistogram,
+)
+from chip8.translator import BlockCPU
+
+
+class CountingProfiler(Profiler):
+    def __init__(self):
+        self.cycles = 0
+
+    def cycle(self):
+        self.cycles += 1
+
+
+class TestCPUProfiler:
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_run_cycles(self, cpu):
+        profiler = CountingProfiler()
+        profiled = CPUProfiler(cpu, [profiler])
+
+        assert profiled.run_cycles(10) == 10
+        assert profiler.cycles == 10
+        assert cpu.registers[0x0] == 5
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0xF0, 0x0A]], indirect=True)
+    def test_run_cycles_stops_at_key_wait(self, cpu):
+        profiler = CountingProfiler()
+        profiled = CPUProfiler(cpu, [profiler])
+
+        assert profiled.run_cycles(10) == 1
+        assert profiled.stop_reason == StopReason.KEY_WAIT
+        assert profiler.cycles == 1
+
+    # V0 += 1, V1 += 1, jump back to the start
+    @pytest.mark.parametrize(
+        "memory", [[0x70, 0x01, 0x71, 0x01, 0x12, 0x00]], indirect=True
+    )
+    def test_run_cycles_runs_whole_blocks(self, memory, display, registers):
+        cpu = BlockCPU(memory, display, registers)
+        profiler = CountingProfiler()
+        profiled = CPUProfiler(cpu, [profiler])
+
+        assert profiled.run_cycles(7) == 7
+        # Two whole blocks, then one instruction interpreted
+        assert profiler.cycles == 3
+        assert list(cpu.blocks) == [0x200]
+        assert cpu.registers[0x0] == 3
+
+    def test_keycode(self, cpu):
+        profiled = CPUProfiler(cpu, [])
+
+        profiled.keycode = 0x5
+
+        assert cpu.keycode == 0x5
+
+    # V0 += 1, V1 += 1, V2 += 1, jump back to the start
+    @pytest.mark.parametrize(
+        "memory", [[0x70, 0x01, 0x71, 0x01, 0x72, 0x01, 0x12, 0x00]], indirect=True
+    )
+    @pytest.mark.parametrize("profiler", [CountingProfiler, OperationProfiler])
+    def test_run_cycles_stops_at_breakpoint(self, cpu, profiler):
+        cpu.breakpoints.add(0x204)
+        profiled = CPUProfiler(cpu, [profiler()])
+
+        assert profiled.run_cycles(10) == 2
+        assert profiled.stop_reason == StopReason.BREAKPOINT
+        assert cpu.program_counter == 0x204
+
+        assert profiled.run_cycles(2) == 2
+        assert cpu.registers[0x2] == 1
+
+
+class RecordingProfiler(Profiler):
+    per_instruction = True
+
+    def __init__(self):
+        self.addresses = []
+
+    def cycle(self):
+        pass
+
+    def executed(self, address, instruction, elapsed):
+        self.addresses.append(address)
+
+
+class TestOperationProfiler:
+    # V0 += 1, V1 = 2, jump back to the start
+    ROM = [0x70, 0x01, 0x61, 0x02, 0x12, 0x00]
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_counts(self, cpu):
+        profiler = OperationProfiler()
+
+        CPUProfiler(cpu, [profiler]).run_cycles(9)
+
+        assert profiler.counts == {
+            OperationType.ADD: 3,
+            OperationType.SET_REGISTER: 3,
+            OperationType.JUMP: 3,
+        }
+        assert all(profiler.elapsed[t] > 0 for t in profiler.counts)
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_block_cpu_runs_per_instruction(self, memory, display, registers):
+        cpu = BlockCPU(memory, display, registers)
+        profiler = RecordingProfiler()
+
+        assert CPUProfiler(cpu, [profiler]).run_cycles(4) == 4
+        assert profiler.addresses == [0x200, 0x202, 0x204, 0x200]
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_json(self, cpu, tmp_path):
+        path = tmp_path / "profile.json"
+        profiler = OperationProfiler()
+        profiled = CPUProfiler(cpu, [profiler], json_path=path)
+        profiled.run_cycles(3)
+
+        profiled.shutdown()
+
+        exported = json.loads(path.read_text())["OperationProfiler"]
+        assert set(exported) == {"ADD", "SET_REGISTER", "JUMP"}
+        assert exported["ADD"]["count"] == 1
+
+    def test_str(self):
+        profiler = OperationProfiler()
+        profiler.executed(0x200, decode_table()[0xD015], 300)
+        profiler.executed(0x202, decode_table()[0x7001], 100)
+
+        lines = str(profiler).splitlines()
+
+        assert "DISPLAY" in lines[2]
+        assert "75.0%" in lines[2]
+
+
+class TestCPUFrequencyProfiler:
+    def test_records_each_second(self, monkeypatch):
+        now = [100.5]
+        monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+        profiler = CPUFrequencyProfiler()
+
+        for _ in range(10):
+            profiler.cycle()
+        now[0] = 101.5
+        profiler.cycle()
+
+        assert profiler.histogram.total.count == 1
+        assert profiler.histogram.total.max == 10
+
+    def test_stop_records_partial_second(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+        profiler = CPUFrequencyProfiler()
+
+        for _ in range(50):
+            profiler.cycle()
+        now[0] = 100.25
+        profiler.stop()
+
+        assert profiler.histogram.total.count == 1
+        assert profiler.histogram.total.max == 200
+        assert "count=1" in str(profiler)
+
+    def test_stop_without_cycles(self):
+        profiler = CPUFrequencyProfiler()
+
+        profiler.stop()
+
+        assert profiler.histogram.total.count == 0
+
+
+class TestWindowedHistogram:
+    def test_snapshots(self):
+        histogram = WindowedHistogram(window=1.0, snapshots=2)
+        histogram.started = 0.0
+
+        histogram.record(10, now=0.5)
+        histogram.record(20, now=1.0)
+        histogram.record(30, now=1.5)
+        histogram.record(40, now=2.0)
+        histogram.record(50, now=3.0)
+
+        assert [s["count"] for s in histogram.snapshots] == [2, 1]
+        assert histogram.snapshots[-1]["max"] == 50
+        assert histogram.total.count == 5
+
+
+class TestAddressProfiler:
+    # fmt: off
+    ROM = [
+        0x22, 0x06,  # 0x200 Call 0x206
+        0x12, 0x00,  # 0x202 Jump to 0x200
+        0x00, 0x00,
+        0xA3, 0x00,  # 0x206 I = 0x300
+        0xF1, 0x55,  # 0x208 Write V0, V1 to 0x300
+        0xD0, 0x13,  # 0x20A Draw 3 bytes from 0x300
+        0x00, 0xEE,  # 0x20C Return
+    ]
+    # fmt: on
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_counts(self, cpu):
+        profiler = AddressProfiler()
+
+        CPUProfiler(cpu, [profiler]).run_cycles(12)
+
+        assert profiler.executions[0x200] == 2
+        assert profiler.executions[0x20C] == 2
+        assert profiler.writes == {0x300: 2, 0x301: 2}
+        assert profiler.reads == {0x300: 2, 0x301: 2, 0x302: 2}
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_collapsed(self, cpu):
+        profiler = AddressProfiler()
+
+        CPUProfiler(cpu, [profiler]).run_cycles(12)
+
+        assert profiler.collapsed().splitlines() == ["0x200 4", "0x200;0x206 8"]
+
+    @pytest.mark.parametrize("memory", [ROM], indirect=True)
+    def test_disassembly(self, cpu):
+        profiler = AddressProfiler()
+
+        CPUProfiler(cpu, [profiler]).run_cycles(7)
+
+        lines = profiler.disassembly().splitlines()
+        assert lines[0].split() == ["0x200", "2206", "CALL", "0x206", "2"]
+        assert lines[-1].split() == ["0x20c", "00EE", "RET", "1"]
+
+
+class TestSamplingProfiler:
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_sample(self, cpu):
+        profiler = SamplingProfiler(rate=1000)
+        profiler.cpu = cpu
+        profiler.target = threading.get_ident()
+
+        profiler.sample()
+        cpu.program_counter = 0x202
+        profiler.sample()
+        profiler.sample()
+
+        assert profiler.samples == 3
+        assert profiler.addresses == {0x200: 1, 0x202: 2}
+        assert profiler.operations.counts == {
+            OperationType.ADD: 1,
+            OperationType.JUMP: 2,
+        }
+        assert profiler.operations.elapsed[OperationType.JUMP] == 2_000_000
+        # Sampled from this thread, the host frame is sample itself
+        assert all(frame.startswith("sample ") for frame in profiler.frames)
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_throttling_is_idle(self, cpu):
+        profiler = SamplingProfiler(rate=1000)
+        profiler.cpu = cpu
+        profiler.target = threading.get_ident()
+
+        def throttle():
+            profiler.sample()
+
+        throttle()
+        profiler.sample()
+
+        assert profiler.samples == 2
+        assert profiler.idle == 1
+        assert profiler.addresses == {0x200: 1}
+        assert profiler.operations.counts == {OperationType.ADD: 1}
+
+    @pytest.mark.parametrize("memory", [[0x70, 0x01, 0x12, 0x00]], indirect=True)
+    def test_samples_in_background(self, cpu):
+        profiler = SamplingProfiler(rate=1000)
+        profiled = CPUProfiler(cpu, [profiler])
+
+        while profiler.samples < 5:
+            profiled.run_cycles(1000)
+        profiler.stop()
+
+        assert not profiler.thread.is_alive()
+        # Samples can land between advancing the program counter and jumping
+        assert set(profiler.addresses) <= {0x200, 0x202, 0x204}
+        assert "Samples:" in str(profiler)
+
+
+class TestDisplayProfiler:
+    def test_counts(self):
+        display = Display()
+        profiler = DisplayProfiler(display)
+
+        assert profiler.draw_sprite([0b11000000, 0b10000000], 0, 0) is False
+        assert profiler.draw_sprite([0b10000000], 0, 0) is True
+        profiler.update()
+        profiler.clear()
+        profiler.stop()
+
+        assert profiler.totals["draw_sprite"]["calls"] == 2
+        assert profiler.totals["draw_sprite"]["pixels"] == 4
+        assert profiler.totals["draw_sprite"]["collisions"] == 1
+        # Headless displays present nothing
+        assert profiler.totals["update"]["pixels"] == 0
+        assert profiler.totals["clear"]["pixels"] == 64 * 32
+        assert display.frames == 1
+        assert profiler.rows is display.rows
+        assert "draw_sprite" in str(profiler)
+        assert profiler.to_json()["totals"]["clear"]["calls"] == 1
+
+    def test_snapshots_each_second(self):
+        profiler = DisplayProfiler(Display())
+        profiler.second -= 1_000_000_000
+
+        profiler.update()
+
+        assert len(profiler.seconds) == 1
+        assert profiler.seconds[0]["update"]["calls"] == 1
+        assert profiler.current["update"]["calls"] == 0
+
+    # Clear, draw the sprite at I, loop
+    @pytest.mark.parametrize(
+        "memory", [[0x00, 0xE0, 0xD0, 0x01, 0x12, 0x00]], indirect=True
+    )
+    def test_attach(self, cpu):
+        display = cpu.display
+        profiler = DisplayProfiler()
+        profiled = CPUProfiler(cpu, [profiler])
+
+        assert profiled.run_cycles(4) == 4
+        assert profiled.display is profiler
+        assert profiler.display is display
+        assert profiler.current["clear"]["calls"] == 2
+        assert profiler.current["draw_sprite"]["calls"] == 1
@@ -0,0 +1,110 @@
+import pytest
+
+from chip8.cpu import CPU
+from chip8.memory import Memory
+from chip8.recompiler import CompiledCPU, discover, load, recompile, rom_hash
+from tests.test_translator import ROM, create_cpu, state
+
+# fmt: off
+BRANCHES = [
+    0x30, 0x00,  # 0x200 Skip if V0 == 0
+    0x12, 0x08,  # 0x202 Jump to 0x208
+    0x22, 0x0A,  # 0x204 Call 0x20A
+    0x12, 0x04,  # 0x206 Jump to 0x204
+    0x00, 0x00,  # 0x208 Unhandled, never reached
+    0x70, 0x01,  # 0x20A V0 += 1
+    0x00, 0xEE,  # 0x20C Return
+]
+# fmt: on
+
+
+@pytest.fixture
+def module(tmp_path):
+    return load(bytes(ROM), cache_dir=tmp_path)
+
+
+class TestDiscover:
+    def test_follows_branches(self):
+        memory = Memory()
+        for location, instruction in enumerate(BRANCHES, start=0x200):
+            memory[location] = instruction
+
+        blocks = discover(memory)
+
+        assert sorted(blocks) == [0x200, 0x202, 0x204, 0x206, 0x20A]
+
+    def test_falls_through_to_key_wait(self):
+        memory = Memory()
+        # V0 = 1, wait for a key in V0, V1 = 2, jump to self
+        for location, instruction in enumerate(
+            [0x60, 0x01, 0xF0, 0x0A, 0x61, 0x02, 0x12, 0x06], start=0x200
+        ):
+            memory[location] = instruction
+
+        blocks = discover(memory)
+
+        assert sorted(blocks) == [0x200, 0x202, 0x204, 0x206]
+
+    def test_key_wait_only_falls_through(self):
+        memory = Memory()
+        # Wait for a key in V0, jump to self, then data
+        for location, instruction in enumerate(
+            [0xF0, 0x0A, 0x12, 0x02, 0x60, 0x01], start=0x200
+        ):
+            memory[location] = instruction
+
+        blocks = discover(memory)
+
+        assert sorted(blocks) == [0x200, 0x202]
+
+    def test_skips_unhandled_operations(self):
+        memory = Memory()
+
+        assert discover(memory) == {}
+
+
+class TestLoad:
+    def test_writes_cache(self, tmp_path, module):
+        assert [p.name for p in tmp_path.iterdir()] == [f"{rom_hash(bytes(ROM))}.py"]
+
+    def test_reuses_cache(self, tmp_path, module):
+        path = next(tmp_path.iterdir())
+        path.write_text(path.read_text() + "CACHED = True\n")
+
+        assert load(bytes(ROM), cache_dir=tmp_path).CACHED
+
+    def test_keyed_by_rom(self, tmp_path, module):
+        load(bytes(BRANCHES), cache_dir=tmp_path)
+
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_source_compiles(self):
+        compile(recompile(bytes(ROM)), "<rom>", "exec")
+
+
+class TestCompiledCPU:
+    @pytest.mark.parametrize("cycles", [1, 10, 100, 500, 2000])
+    def test_conforms_to_cpu(self, display, module, cycles):
+        reference = create_cpu(CPU, display)
+        cpu = create_cpu(CompiledCPU, display)
+        cpu.install(module)
+
+        executed = 0
+        while executed < cycles:
+            executed += cpu.cycle()
+
+        for _ in range(executed):
+            reference.cycle()
+
+        assert state(cpu) == state(reference)
+
+    def test_falls_back_to_interpreter(self, display, module):
+        cpu = create_cpu(CompiledCPU, display)
+        cpu.install(module)
+
+        # Jump into the middle of a block, which the recompiler never saw
+        cpu.program_counter = 0x212
+
+        assert cpu.cycle() == 1
+        assert cpu.program_counter == 0x214
+        assert 0x212 not in cpu.blocks
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from chip8.backends.headless import Display, HeadlessBackend
+from chip8.interpreter import Interpreter
+from chip8.tracing import TracedDisplay, TraceProfiler
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    return tmp_path / "trace.json"
+
+
+class TestTraceProfiler:
+    def test_events(self, trace_path):
+        trace = TraceProfiler(trace_path)
+
+        trace.span("poll", 1_000, 3_000)
+        trace.frame(1_000, 9_000, 8)
+        trace.stop()
+
+        events = json.loads(trace_path.read_text())
+        assert events[0]["ph"] == "M"
+        poll, frame = events[1:]
+        assert poll["name"] == "poll"
+        assert poll["ph"] == "X"
+        assert poll["ts"] == 1.0
+        assert poll["dur"] == 2.0
+        assert frame["name"] == "frame"
+        assert frame["args"] == {"instructions": 8}
+
+    def test_stream_is_readable_before_stop(self, trace_path):
+        trace = TraceProfiler(trace_path)
+        trace.span("poll", 1_000, 3_000)
+        trace.file.flush()
+
+        events = json.loads(trace_path.read_text() + "]")
+        assert [event["name"] for event in events] == ["thread_name", "poll"]
+        trace.stop()
+
+    # Clear, draw the sprite at I, loop
+    @pytest.mark.parametrize(
+        "memory", [[0x00, 0xE0, 0xD0, 0x05, 0x12, 0x00]], indirect=True
+    )
+    def test_interpreter(self, cpu, trace_path):
+        trace = TraceProfiler(trace_path)
+        cpu.display = TracedDisplay(Display(), trace)
+        interpreter = Interpreter(HeadlessBackend(frames=2), cpu, 4, [trace])
+
+        interpreter.run()
+
+        events = json.loads(trace_path.read_text())
+        names = [event["name"] for event in events]
+        assert names.count("frame") == 2
+        assert names.count("clear") == 3
+        assert names.count("draw_sprite") == 3
+        for name in ("throttle", "poll", "cpu", "update"):
+            assert name in names
+        assert cpu.display.display.frames == 2
+        assert trace.file.closed
+
+
+class TestTracedDisplay:
+    def test_passes_through(self, trace_path):
+        display = Display()
+        traced = TracedDisplay(display, TraceProfiler(trace_path))
+
+        assert traced.draw_sprite([0x80], 0, 0) is False
+        assert traced.draw_sprite([0x80], 0, 0) is True
+        assert traced.rows is display.rows
+        assert str(traced) == str(display)
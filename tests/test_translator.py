@@ -0,0 +1,204 @@
+import pytest
+
+from chip8.cpu import CPU, Registers, StopReason
+from chip8.memory import Memory
+from chip8.translator import BlockCPU, scan, translate
+
+# fmt: off
+ROM = [
+    0x60, 0x71,  # 0x200 V0 = 0x71
+    0x61, 0x05,  # 0x202 V1 = 0x05
+    0xA2, 0x0E,  # 0x204 I = 0x20E
+    0xF1, 0x55,  # 0x206 Write V0, V1 to 0x20E, replacing V1 += 1 with V1 += 5
+    0x62, 0x30,  # 0x208 V2 = 0x30
+    0xF2, 0x15,  # 0x20A delay timer = V2
+    0x63, 0x00,  # 0x20C V3 = 0
+    0x71, 0x01,  # 0x20E V1 += 1, rewritten to V1 += 5
+    0x73, 0x01,  # 0x210 V3 += 1
+    0xF4, 0x07,  # 0x212 V4 = delay timer
+    0x33, 0x20,  # 0x214 Skip if V3 == 0x20
+    0x12, 0x10,  # 0x216 Jump to 0x210
+    0x22, 0x20,  # 0x218 Call 0x220
+    0xA3, 0x00,  # 0x21A I = 0x300
+    0xF4, 0x33,  # 0x21C Store BCD of V4 at I
+    0x12, 0x00,  # 0x21E Jump to 0x200
+    0x81, 0x34,  # 0x220 V1 += V3
+    0x85, 0x16,  # 0x222 V5 = V1 >> 1
+    0x00, 0xEE,  # 0x224 Return
+]
+# fmt: on
+
+
+def create_cpu(cls, display, rom=ROM):
+    memory = Memory()
+    for location, instruction in enumerate(rom, start=0x200):
+        memory[location] = instruction
+
+    return cls(memory, display, Registers())
+
+
+def state(cpu):
+    return (
+        list(cpu.registers.v),
+        cpu.program_counter,
+        cpu.index,
+        cpu.stack_pointer,
+        dict(cpu.stack),
+        cpu.delay_timer,
+        cpu.sound_timer,
+        list(cpu.memory.memory),
+    )
+
+
+class TestScan:
+    def test_stops_at_terminator(self, display):
+        cpu = create_cpu(CPU, display)
+
+        code = scan(cpu.memory, 0x20E)
+
+        assert [address for address, _ in code] == [0x20E, 0x210, 0x212, 0x214]
+
+    def test_stops_before_unhandled_operation(self, display):
+        cpu = create_cpu(CPU, display, rom=[0x60, 0x01, 0xF0, 0x1F])
+
+        code = scan(cpu.memory, 0x200)
+
+        assert [address for address, _ in code] == [0x200]
+
+    def test_key_wait_starts_block(self, display):
+        cpu = create_cpu(CPU, display, rom=[0x60, 0x01, 0xF0, 0x0A])
+
+        assert [address for address, _ in scan(cpu.memory, 0x200)] == [0x200]
+        assert [address for address, _ in scan(cpu.memory, 0x202)] == [0x202]
+
+    def test_unhandled_operation(self, display):
+        cpu = create_cpu(CPU, display, rom=[0xF0, 0x1F])
+
+        assert translate(cpu.memory, 0x200) is None
+
+
+class TestBlockCPU:
+    @pytest.mark.parametrize("cycles", [1, 10, 100, 500, 2000])
+    def test_conforms_to_cpu(self, display, cycles):
+        reference = create_cpu(CPU, display)
+        cpu = create_cpu(BlockCPU, display)
+
+        executed = 0
+        while executed < cycles:
+            executed += cpu.cycle()
+
+        for _ in range(executed):
+            reference.cycle()
+
+        assert state(cpu) == state(reference)
+
+    def test_caches_blocks(self, display):
+        cpu = create_cpu(BlockCPU, display)
+
+        cpu.program_counter = 0x210
+        cpu.cycle()
+        block = cpu.blocks[0x210]
+        cpu.program_counter = 0x210
+        cpu.cycle()
+
+        assert cpu.blocks[0x210] is block
+
+    def test_load_registers_invalidates_block(self, display):
+        cpu = create_cpu(BlockCPU, display)
+        cpu.program_counter = 0x20E
+        cpu.cycle()
+        block = cpu.blocks[0x20E]
+
+        cpu.program_counter = 0x200
+        cpu.cycle()
+
+        assert block.stale
+        assert 0x20E not in cpu.blocks
+
+    def test_binary_coded_decimal_invalidates_block(self, display):
+        cpu = create_cpu(BlockCPU, display)
+        cpu.program_counter = 0x210
+        cpu.cycle()
+        block = cpu.blocks[0x210]
+
+        cpu.index = 0x210
+        cpu.registers[0x4] = 0xFF
+        cpu.execute(cpu.decode(0xF433))
+
+        assert block.stale
+        assert 0x210 not in cpu.blocks
+
+    def test_self_modifying_block_exits_early(self, display):
+        cpu = create_cpu(BlockCPU, display)
+
+        executed = cpu.cycle()
+
+        # The block stops after writing over its own code.
+        assert executed == 4
+        assert cpu.program_counter == 0x208
+        assert cpu.blocks == {}
+
+    @pytest.mark.parametrize("cycles", [1, 100, 2000])
+    def test_run_cycles_conforms_to_cpu(self, display, cycles):
+        reference = create_cpu(CPU, display)
+        cpu = create_cpu(BlockCPU, display)
+
+        executed = cpu.run_cycles(cycles)
+        reference.run_cycles(executed)
+
+        assert executed == cycles
+        assert state(cpu) == state(reference)
+
+    def test_run_cycles_interprets_past_budget(self, display):
+        # V0 = 1, V1 = 2, V2 = 3, jump back to the start
+        cpu = create_cpu(
+            BlockCPU, display, rom=[0x60, 0x01, 0x61, 0x02, 0x62, 0x03, 0x12, 0x00]
+        )
+
+        assert cpu.run_cycles(2) == 2
+        assert cpu.stop_reason == StopReason.CYCLES
+        assert cpu.program_counter == 0x204
+        assert cpu.registers[0x2] == 0
+
+    def test_run_cycles_stops_at_key_wait(self, display):
+        cpu = create_cpu(BlockCPU, display, rom=[0x60, 0x01, 0xF0, 0x0A])
+
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.KEY_WAIT
+        assert cpu.program_counter == 0x202
+
+    def test_run_cycles_stops_at_jump_to_self(self, display):
+        cpu = create_cpu(BlockCPU, display, rom=[0x60, 0x01, 0x12, 0x02])
+
+        assert cpu.run_cycles(10) == 2
+        assert cpu.stop_reason == StopReason.JUMP_TO_SELF
+        assert cpu.program_counter == 0x202
+
+    def test_run_cycles_stops_at_delay_wait(self, display):
+        cpu = create_cpu(BlockCPU, display, rom=[0xF1, 0x07, 0x31, 0x00, 0x12, 0x00])
+        cpu.delay_timer = 2
+
+        assert cpu.run_cycles(10) == 2
+        assert cpu.stop_reason == StopReason.DELAY_WAIT
+        assert cpu.program_counter == 0x204
+
+    def test_run_cycles_key_wait_accepts_key_zero(self, display):
+        cpu = create_cpu(BlockCPU, display, rom=[0x61, 0x07, 0xF1, 0x0A])
+        cpu.keycode = 0x0
+
+        assert cpu.run_cycles(2) == 2
+        assert cpu.registers[0x1] == 0x0
+        assert cpu.program_counter == 0x204
+
+    def test_run_cycles_stops_at_unhandled_operation(self, display):
+        cpu = create_cpu(BlockCPU, display, rom=[0x60, 0x01, 0xF0, 0x1F])
+
+        assert cpu.run_cycles(10) == 1
+        assert cpu.stop_reason == StopReason.UNHANDLED_OPERATION
+
+    def test_run_cycles_stops_at_breakpoint_inside_block(self, display):
+        cpu = create_cpu(BlockCPU, display)
+        cpu.breakpoints.add(0x206)
+
+        assert cpu.run_cycles(10) == 3
+        assert cpu.stop_reason == StopReason.BREAKPOINT